@@ -1,4 +1,18 @@
-from split_schedule.schedule_builder import ScheduleBuilder  # noqa: F401
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from split_schedule.schedule_builder import ScheduleBuilder  # noqa: F401
 
 name = "split-schedule"
 __version__ = "0.3.2"
+
+
+def __getattr__(name: str) -> Any:
+    # ScheduleBuilder is imported on first use so the core engine can be used without importing
+    # pandas
+    if name == "ScheduleBuilder":
+        from split_schedule import schedule_builder
+
+        return schedule_builder.ScheduleBuilder
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pandas as pd
+
+
+def make_cache_key(df: pd.DataFrame, **params: Any) -> str:
+    normalized_df = (
+        df[["block", "class", "student"]]
+        .astype({"class": str, "student": str})
+        .sort_values(by=["block", "class", "student"])
+        .reset_index(drop=True)
+    )
+    key_hash = hashlib.sha256()
+    key_hash.update(pd.util.hash_pandas_object(normalized_df, index=False).to_numpy().tobytes())
+    key_hash.update(json.dumps(params, sort_keys=True).encode())
+
+    return key_hash.hexdigest()
+
+
+class ResultCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, df: pd.DataFrame) -> None:
+        pass
+
+
+class MemoryCache(ResultCache):
+    def __init__(self, max_entries: int = 128) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self._results: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        # Async builds run in threads that can share one cache
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            df = self._results.get(key)
+            if df is None:
+                return None
+
+            self._results.move_to_end(key)
+
+        return df.copy()
+
+    def set(self, key: str, df: pd.DataFrame) -> None:
+        df = df.copy()
+        with self._lock:
+            self._results[key] = df
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+
+class DiskCache(ResultCache):
+    def __init__(self, directory: Union[Path, str], max_bytes: int = 256 * 1024 * 1024) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+        self.directory = Path(directory) if isinstance(directory, str) else directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        file_path = self._file_path(key)
+        try:
+            df = pd.read_pickle(file_path)
+        except (FileNotFoundError, EOFError):
+            return None
+
+        # The modified time is used as the last access time for the LRU eviction. The file can be
+        # evicted by another build after it is read.
+        try:
+            os.utime(file_path)
+        except FileNotFoundError:
+            pass
+
+        return df
+
+    def set(self, key: str, df: pd.DataFrame) -> None:
+        _replace_pickle(df, self._file_path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for file_path in self.directory.glob("*.pkl"):
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_path))
+
+        total_bytes = sum(x[1] for x in entries)
+        for _, size, file_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            file_path.unlink(missing_ok=True)
+            total_bytes -= size
+
+    def _file_path(self, key: str) -> Path:
+        return self.directory.joinpath(f"{key}.pkl")
+
+
+class InputCache:
+    def __init__(self, directory: Optional[Union[Path, str]] = None) -> None:
+        # Cached copies are unpickled when they are read, so by default they are kept in a
+        # directory only the current user can write to rather than next to a shared schedule file
+        if directory is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home().joinpath(".cache")
+            self.directory = Path(cache_home).joinpath("split_schedule")
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        else:
+            self.directory = Path(directory) if isinstance(directory, str) else directory
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, file_path: Path) -> Optional[pd.DataFrame]:
+        try:
+            cached = pd.read_pickle(self._cache_path(file_path))
+        except (FileNotFoundError, EOFError):
+            return None
+
+        if cached["source"] != self._source_key(file_path):
+            return None
+
+        return cached["df"]
+
+    def set(self, file_path: Path, df: pd.DataFrame) -> None:
+        _replace_pickle(
+            {"source": self._source_key(file_path), "df": df}, self._cache_path(file_path)
+        )
+
+    def _cache_path(self, file_path: Path) -> Path:
+        path_hash = hashlib.sha256(str(file_path.resolve()).encode()).hexdigest()
+        return self.directory.joinpath(f"{path_hash}.pkl")
+
+    def _source_key(self, file_path: Path) -> dict[str, Union[str, int]]:
+        stat = file_path.stat()
+        return {"path": str(file_path.resolve()), "mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _replace_pickle(obj: Any, file_path: Path) -> None:
+    # Each write gets its own temporary file so builds saving the same file from different threads
+    # or processes never write to the same temporary file
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        pd.to_pickle(obj, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,610 @@
+from __future__ import annotations
+
+import csv
+import logging
+from collections import Counter, deque
+from contextlib import nullcontext
+from itertools import combinations
+from math import ceil, floor
+from pathlib import Path
+from random import randrange, shuffle
+from typing import TYPE_CHECKING, ContextManager, NoReturn, Optional, Sequence, Union
+
+from split_schedule.day_policy import DAY_POLICIES, order_days
+from split_schedule.errors import InfeasibleScheduleError, SchedulingError
+from split_schedule.ordering import ORDERINGS, order_students
+from split_schedule.portfolio import StrategyPortfolio, validate_strategies
+from split_schedule.preflight import find_violations
+from split_schedule.profiling import MemoryProfiler
+from split_schedule.schedule_types import (
+    BlockedSection,
+    ReducedClass,
+    ScheduleTotalStudents,
+    Strategy,
+)
+from split_schedule.sections import Section
+
+if TYPE_CHECKING:
+    from split_schedule.problem import EncodedProblem
+
+SCHEDULE_COLUMNS = (
+    "block",
+    "class",
+    "total_students",
+    "max_students",
+    "num_classes",
+    "day_number",
+    "student",
+)
+
+
+def build_schedule(
+    block: Sequence[int],
+    class_name: Sequence[str],
+    student: Sequence[str],
+    reduce_by: float = 0.2,
+    smallest_allowed: int = 1,
+    max_tries: int = 10,
+    ordering: str = "matches",
+    day_policy: str = "random",
+    verbose: bool = False,
+    backtrack_depth: int = 0,
+    portfolio: Optional[Sequence[Strategy]] = None,
+) -> dict[str, list]:
+    schedule_engine = ScheduleEngine(
+        ordering=ordering,
+        day_policy=day_policy,
+        backtrack_depth=backtrack_depth,
+        portfolio=portfolio,
+    )
+    schedule_engine._set_columns(block, class_name, student)
+    schedule_engine._set_verbose(verbose)
+
+    return schedule_engine._build_columns(reduce_by, smallest_allowed, max_tries)
+
+
+def configure_logging() -> None:
+    logging.basicConfig(format="%(asctime)s: %(levelname)s: %(message)s")
+    logging.root.setLevel(level=logging.INFO)
+
+
+def read_csv(schedule_file_path: Union[Path, str]) -> dict[str, list]:
+    columns: dict[str, list] = {"block": [], "class": [], "student": []}
+    with open(schedule_file_path, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or not set(columns) <= set(reader.fieldnames):
+            raise ValueError("The schedule file should contain block, class, and student columns")
+
+        for row in reader:
+            columns["block"].append(int(row["block"]))
+            columns["class"].append(row["class"])
+            columns["student"].append(row["student"])
+
+    return columns
+
+
+def write_csv(columns: dict[str, list], save_path: Union[Path, str]) -> None:
+    with open(save_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(zip(*columns.values()))
+
+
+class ScheduleEngine:
+    def __init__(
+        self,
+        ordering: str = "matches",
+        day_policy: str = "random",
+        backtrack_depth: int = 0,
+        portfolio: Optional[Sequence[Strategy]] = None,
+    ) -> None:
+        if ordering not in ORDERINGS:
+            raise ValueError(f"ordering should be one of: {', '.join(ORDERINGS)}")
+
+        if day_policy not in DAY_POLICIES:
+            raise ValueError(f"day_policy should be one of: {', '.join(DAY_POLICIES)}")
+
+        if backtrack_depth < 0:
+            raise ValueError("backtrack_depth should be 0 or greater")
+
+        if portfolio is not None:
+            validate_strategies(portfolio)
+
+        self._blocks: list[int] = []
+        self._class_names: list[str] = []
+        self._students: list[str] = []
+        self._student_classes: Optional[dict[str, dict[str, dict[int, str]]]] = None
+        self._class_sizes: Optional[list[ScheduleTotalStudents]] = None
+        self._attempt: int = 1
+        self._verbose: bool = False
+        self._ordering = ordering
+        self._day_policy = day_policy
+        self._backtrack_depth = backtrack_depth
+        self._strategies = list(portfolio) if portfolio is not None else None
+        self._portfolio: Optional[StrategyPortfolio] = None
+        self._min_days = 1
+        self._initial_days: dict[str, int] = {}
+        self._memory_profiler: Optional[MemoryProfiler] = None
+        self._blocked_sections: Counter[tuple[int, str]] = Counter()
+
+        # The student code and day of the most recent placements, undone when backtracking
+        self._undo_log: deque[tuple[int, int]] = deque(maxlen=backtrack_depth)
+        self._logger = logging.getLogger()
+
+    def _add_student(
+        self,
+        student_code: int,
+        student_sections: list[Optional[Section]],
+        day: int,
+        total_days: int,
+    ) -> Optional[int]:
+        found_sections = [c for c in student_sections if c is not None]
+
+        if len(found_sections) == len(student_sections):
+            for day_tried in order_days(self._day_policy, found_sections, day, total_days):
+                if all(c.has_room(day_tried) for c in found_sections):
+                    for c in found_sections:
+                        c.add(day_tried, student_code)
+                    return day_tried
+
+        return None
+
+    def _backtrack(
+        self,
+        student_code: int,
+        student_sections: list[list[Optional[Section]]],
+        day: int,
+        total_days: int,
+    ) -> bool:
+        # Undoes the most recent placements one at a time. After each one the stuck student is
+        # placed first and the undone students are placed again on any day with room. If that
+        # fails the try is taken back and the next placement is undone.
+        undone: list[tuple[int, int]] = []
+        while self._undo_log:
+            undone_code, undone_day = self._undo_log.pop()
+            for c in student_sections[undone_code]:
+                if c is not None:
+                    c.remove(undone_day, undone_code)
+            undone.append((undone_code, undone_day))
+
+            placed: list[tuple[int, int]] = []
+            for code in [student_code] + [x for x, _ in reversed(undone)]:
+                placed_day = self._add_student(code, student_sections[code], day, total_days)
+                if placed_day is None:
+                    break
+                placed.append((code, placed_day))
+            else:
+                self._undo_log.extend(placed)
+                return True
+
+            for code, placed_day in placed:
+                for c in student_sections[code]:
+                    if c is not None:
+                        c.remove(placed_day, code)
+
+        for code, undone_day in reversed(undone):
+            for c in student_sections[code]:
+                if c is not None:
+                    c.add(undone_day, code)
+            self._undo_log.append((code, undone_day))
+
+        return False
+
+    def _build_columns(
+        self, reduce_by: float, smallest_allowed: int = 1, max_tries: int = 10
+    ) -> dict[str, list]:
+        fill_classes = self._build_fill_classes(reduce_by, smallest_allowed, max_tries)
+        return self._fill_columns(fill_classes, list(self._get_cached_student_classes()))
+
+    def _build_fill_classes(
+        self, reduce_by: float, smallest_allowed: int = 1, max_tries: int = 10
+    ) -> list[Section]:
+        student_classes_grouped = self._get_cached_student_classes()
+        if not student_classes_grouped:
+            raise ValueError("The schedule does not contain any students")
+
+        while True:
+            classes = self._init_classes(reduce_by, smallest_allowed)
+
+            if self._attempt == 1:
+                self._check_feasibility(reduce_by, smallest_allowed)
+
+            if self._verbose:
+                self._logger.info(f"Schedule build try number {self._attempt}")
+
+            fill_classes = self._fill_attempt(classes, student_classes_grouped)
+            if fill_classes:
+                return fill_classes
+
+            if self._attempt >= max_tries:
+                self._raise_no_schedule()
+
+            if self._verbose:
+                self._logger.info("No schedule found. Retrying")
+
+            self._attempt += 1
+
+    def _check_feasibility(self, reduce_by: float, smallest_allowed: int) -> None:
+        if self._verbose:
+            self._logger.info("Checking schedule feasibility")
+
+        reduced_classes = self._reduce_class(
+            self._get_cached_class_size(), reduce_by, smallest_allowed
+        )
+        violations = find_violations(reduced_classes)
+
+        if violations:
+            if self._verbose:
+                for violation in violations:
+                    self._logger.error(
+                        f"Block {violation['block']} {violation['class_name']}: "
+                        f"{violation['reason']}"
+                    )
+
+            raise InfeasibleScheduleError("No possible schedule found", violations)
+
+        if self._verbose:
+            self._logger.info("Checking schedule feasibility complete")
+
+    def _fill_attempt(
+        self,
+        classes: list[Section],
+        student_classes_grouped: dict[str, dict[str, dict[int, str]]],
+    ) -> Optional[list[Section]]:
+        if self._strategies is None:
+            return self._fill_classes(classes, student_classes_grouped)
+
+        if self._portfolio is None or self._attempt == 1:
+            self._portfolio = StrategyPortfolio(self._strategies)
+
+        index = self._portfolio.select()
+        strategy = self._portfolio.strategies[index]
+        if self._verbose:
+            self._logger.info(
+                f"Try number {self._attempt} uses {strategy['ordering']} ordering, "
+                f"{strategy['day_policy']} days, and backtrack depth {strategy['backtrack_depth']}"
+            )
+
+        configured = (self._ordering, self._day_policy, self._backtrack_depth)
+        self._ordering = strategy["ordering"]
+        self._day_policy = strategy["day_policy"]
+        self._backtrack_depth = strategy["backtrack_depth"]
+        self._undo_log = deque(maxlen=self._backtrack_depth)
+        try:
+            fill_classes = self._fill_classes(classes, student_classes_grouped)
+        finally:
+            self._ordering, self._day_policy, self._backtrack_depth = configured
+            self._undo_log = deque(maxlen=self._backtrack_depth)
+
+        # Failed tries are rewarded by how much of the schedule they filled so the strategies that
+        # get furthest are tried more often
+        if fill_classes:
+            reward = 1.0
+        else:
+            reward = sum(sum(c.counts) for c in classes) / max(
+                sum(c.total_students for c in classes), 1
+            )
+        self._portfolio.update(index, reward, fill_classes is not None)
+
+        return fill_classes
+
+    def _fill_classes(
+        self,
+        fill_classes: list[Section],
+        student_classes_grouped: dict[str, dict[str, dict[int, str]]],
+    ) -> Optional[list[Section]]:
+        sections = {(c.block, c.class_name): c for c in fill_classes}
+        student_codes = {student: i for i, student in enumerate(student_classes_grouped)}
+        student_sections = [
+            [sections.get(x) for x in value["blocks"].items()]
+            for value in student_classes_grouped.values()
+        ]
+        students_added: set[int] = set()
+        self._undo_log.clear()
+
+        total_days = len(fill_classes[0].rosters)
+
+        if self._initial_days:
+            self._seed_initial_days(student_codes, student_sections, total_days, students_added)
+
+        if self._ordering != "matches":
+            day = randrange(total_days)
+            for student_code in order_students(
+                self._ordering,
+                [[c for c in x if c is not None] for x in student_sections],
+                total_days,
+            ):
+                if student_code not in students_added:
+                    if not self._place_student(student_code, student_sections, day, total_days):
+                        return None
+
+            return fill_classes
+
+        with self._memory_phase("find_matches"):
+            matches = self._find_matches()
+
+        for match in matches:
+            for m in match.values():
+                for people in m:
+                    day = randrange(total_days)
+                    for person in people:
+                        if student_codes[person] not in students_added:
+                            if not self._place_student(
+                                student_codes[person], student_sections, day, total_days
+                            ):
+                                return None
+
+                            students_added.add(student_codes[person])
+        day = randrange(total_days)
+        for student_code in student_codes.values():
+            if student_code not in students_added:
+                if not self._place_student(student_code, student_sections, day, total_days):
+                    return None
+
+                students_added.add(student_code)
+        return fill_classes
+
+    def _fill_columns(
+        self, fill_classes: list[Section], student_names: list[str]
+    ) -> dict[str, list]:
+        columns: dict[str, list] = {x: [] for x in SCHEDULE_COLUMNS}
+        for fill in fill_classes:
+            for day in range(len(fill.rosters)):
+                students = [student_names[x] for x in fill.student_codes(day)]
+                total = len(students)
+                columns["block"] += [fill.block] * total
+                columns["class"] += [fill.class_name] * total
+                columns["total_students"] += [fill.total_students] * total
+                columns["max_students"] += [fill.max_students] * total
+                columns["num_classes"] += [fill.num_classes] * total
+                columns["day_number"] += [day + 1] * total
+                columns["student"] += students
+
+        return columns
+
+    def _fill_days(self, fill_classes: list[Section], total_students: int) -> list[int]:
+        days = [0] * total_students
+        for fill in fill_classes:
+            for day in range(len(fill.rosters)):
+                for student_code in fill.student_codes(day):
+                    days[student_code] = day + 1
+
+        return days
+
+    def _find_matches(self) -> list[dict[int, list[list[str]]]]:
+        # Students taking the same classes in the most blocks are grouped first. Each student is
+        # only put in one group and the order is shuffled on retries so new groups are tried.
+        student_classes = self._get_cached_student_classes()
+        blocks = sorted({block for x in student_classes.values() for block in x["blocks"]})
+        total_blocks = blocks[-1]
+        students = list(student_classes)
+        if self._attempt > 1:
+            shuffle(students)
+
+        matches: list[dict[int, list[list[str]]]] = []
+        for i in range(total_blocks, 1, -1):
+            matches.append({i: []})
+
+        matched: set[str] = set()
+        for comb in (c for r in range(len(blocks), 1, -1) for c in combinations(blocks, r)):
+            groups: dict[tuple[str, ...], list[str]] = {}
+            for student in students:
+                student_blocks = student_classes[student]["blocks"]
+                if student not in matched and all(x in student_blocks for x in comb):
+                    groups.setdefault(tuple(student_blocks[x] for x in comb), []).append(student)
+
+            for key in sorted(groups):
+                if len(groups[key]) > 1:
+                    matches[total_blocks - len(comb)][len(comb)].append(groups[key])
+                    matched.update(groups[key])
+
+        return matches
+
+    def _get_cached_class_size(self) -> list[ScheduleTotalStudents]:
+        if self._class_sizes is None:
+            self._class_sizes = self._get_class_size()
+
+        # Copies are returned because the class sizes are updated in place when reducing classes
+        return [c.copy() for c in self._class_sizes]
+
+    def _get_cached_student_classes(self) -> dict[str, dict[str, dict[int, str]]]:
+        if self._student_classes is None:
+            self._student_classes = self._get_student_classes()
+
+        return self._student_classes
+
+    def _get_class_size(self) -> list[ScheduleTotalStudents]:
+        class_size = Counter(zip(self._blocks, self._class_names))
+        return [
+            {"block": block, "class_name": class_name, "total_students": total_students}
+            for (block, class_name), total_students in sorted(class_size.items())
+        ]
+
+    def _get_student_classes(self) -> dict[str, dict[str, dict[int, str]]]:
+        student_classes: dict[str, dict[str, dict[int, str]]] = {}
+        for block, class_name, student in sorted(
+            zip(self._blocks, self._class_names, self._students), key=lambda x: (x[0], x[1])
+        ):
+            if student in student_classes:
+                student_classes[student]["blocks"][block] = class_name
+            else:
+                student_classes[student] = {"blocks": {block: class_name}}
+
+        return student_classes
+
+    def _get_total_classes(self, reduced_classes: list[ReducedClass]) -> int:
+        total_classes = 1
+        for c in reduced_classes:
+            if c["num_classes"] > total_classes:
+                total_classes = c["num_classes"]
+
+        return total_classes
+
+    def _init_classes(self, reduce_by: float, smallest_allowed: int) -> list[Section]:
+        class_sizes = self._get_cached_class_size()
+        reduced_classes = self._reduce_class(
+            class_size=class_sizes, reduce_by=reduce_by, smallest_allowed=smallest_allowed
+        )
+        total_classes = max(self._get_total_classes(reduced_classes), self._min_days)
+
+        return [
+            Section(
+                c["block"],
+                c["class_name"],
+                c["total_students"],
+                c["max_students"],
+                c["num_classes"],
+                total_classes,
+            )
+            for c in reduced_classes
+        ]
+
+    def _memory_phase(self, name: str, in_attempt: bool = True) -> ContextManager[None]:
+        if self._memory_profiler is None:
+            return nullcontext()
+
+        return self._memory_profiler.phase(name, self._attempt if in_attempt else None)
+
+    def _move_blocking_student(
+        self,
+        student_code: int,
+        student_sections: list[list[Optional[Section]]],
+        day: int,
+        total_days: int,
+    ) -> bool:
+        # Makes room for the student by moving one student that is in all of the student's full
+        # classes on a day to another day that has room in all of their classes
+        found_sections = [c for c in student_sections[student_code] if c is not None]
+        if len(found_sections) != len(student_sections[student_code]):
+            return False
+
+        for day_tried in order_days(self._day_policy, found_sections, day, total_days):
+            full_sections = [c for c in found_sections if not c.has_room(day_tried)]
+            blocking = set.intersection(*(c.rosters[day_tried] for c in full_sections))
+            for blocking_code in sorted(blocking):
+                blocking_sections = [c for c in student_sections[blocking_code] if c is not None]
+                for move_day in range(total_days):
+                    if move_day != day_tried and all(
+                        c.has_room(move_day) for c in blocking_sections
+                    ):
+                        for c in blocking_sections:
+                            c.remove(day_tried, blocking_code)
+                            c.add(move_day, blocking_code)
+                        for c in found_sections:
+                            c.add(day_tried, student_code)
+                        return True
+
+        return False
+
+    def _place_student(
+        self,
+        student_code: int,
+        student_sections: list[list[Optional[Section]]],
+        day: int,
+        total_days: int,
+    ) -> bool:
+        placed_day = self._add_student(
+            student_code, student_sections[student_code], day, total_days
+        )
+        if placed_day is not None:
+            self._undo_log.append((student_code, placed_day))
+            return True
+
+        if self._initial_days and self._move_blocking_student(
+            student_code, student_sections, day, total_days
+        ):
+            # The moved student's logged day is out of date so the earlier placements are kept
+            self._undo_log.clear()
+            return True
+
+        if self._backtrack_depth and self._backtrack(
+            student_code, student_sections, day, total_days
+        ):
+            return True
+
+        self._record_blocked_sections([c for c in student_sections[student_code] if c is not None])
+        return False
+
+    def _raise_no_schedule(self) -> NoReturn:
+        blocked_sections: list[BlockedSection] = [
+            {"block": block, "class_name": class_name, "times_blocked": times_blocked}
+            for (block, class_name), times_blocked in self._blocked_sections.most_common()
+        ]
+
+        if self._verbose and blocked_sections:
+            most_blocked = ", ".join(
+                f"block {x['block']} {x['class_name']} ({x['times_blocked']})"
+                for x in blocked_sections[:3]
+            )
+            self._logger.error(f"Classes that most often had no room: {most_blocked}")
+
+        raise SchedulingError("No possible schedule found", blocked_sections)
+
+    def _record_blocked_sections(self, student_sections: list[Section]) -> None:
+        for c in student_sections:
+            if c.has_full_day():
+                self._blocked_sections[(c.block, c.class_name)] += 1
+
+    def _reduce_class(
+        self, class_size: list[ScheduleTotalStudents], reduce_by: float, smallest_allowed: int
+    ) -> list[ReducedClass]:
+        reduced_class: list[ReducedClass] = class_size  # type: ignore
+        for c in reduced_class:
+            reduced = floor(c["total_students"] * reduce_by)
+            size = max(reduced, smallest_allowed)
+            num_classes = ceil(c["total_students"] / size) if size > 0 else 0
+            c["max_students"] = size
+            c["num_classes"] = num_classes
+
+        return reduced_class
+
+    def _seed_initial_days(
+        self,
+        student_codes: dict[str, int],
+        student_sections: list[list[Optional[Section]]],
+        total_days: int,
+        students_added: set[int],
+    ) -> None:
+        for student, student_code in student_codes.items():
+            day = self._initial_days.get(student)
+            if day is None or day >= total_days:
+                continue
+
+            found_sections = [c for c in student_sections[student_code] if c is not None]
+            if len(found_sections) == len(student_sections[student_code]) and all(
+                c.has_room(day) for c in found_sections
+            ):
+                for c in found_sections:
+                    c.add(day, student_code)
+                students_added.add(student_code)
+
+        if self._verbose:
+            self._logger.info(
+                f"{len(students_added)} of {len(student_codes)} students kept their previous day"
+            )
+
+    def _set_columns(
+        self, block: Sequence[int], class_name: Sequence[str], student: Sequence[str]
+    ) -> None:
+        if not len(block) == len(class_name) == len(student):
+            raise ValueError("block, class_name, and student should be the same length")
+
+        # NumPy values are converted so the results only contain plain Python values
+        self._blocks = [int(x) for x in block]
+        self._class_names = [str(x) for x in class_name]
+        self._students = [str(x) for x in student]
+        self._attempt = 1
+        self._blocked_sections = Counter()
+        self._student_classes = None
+        self._class_sizes = None
+
+    def _set_problem(self, problem: EncodedProblem) -> None:
+        self._attempt = 1
+        self._blocked_sections = Counter()
+        self._student_classes = problem.student_classes()
+        self._class_sizes = problem.class_sizes()
+
+    def _set_verbose(self, verbose: bool) -> None:
+        self._verbose = verbose
+        if verbose:
+            configure_logging()
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Iterable
+
+from split_schedule.sections import Section
+
+DAY_POLICIES = ("random", "most_room")
+
+
+def order_days(
+    day_policy: str, student_sections: list[Section], day: int, total_days: int
+) -> Iterable[int]:
+    if day_policy == "random":
+        # The random day is tried first, then the remaining days in order
+        return chain([day], (x for x in range(total_days) if x != day))
+
+    if day_policy == "most_room":
+        # Days are tried by the room left in the student's fullest class that day. Starting from
+        # the random day keeps ties from always going to the first day.
+        days = [(day + x) % total_days for x in range(total_days)]
+        return sorted(
+            days,
+            key=lambda x: -min((c.max_students - c.counts[x] for c in student_sections), default=0),
+        )
+
+    raise ValueError(f"Unknown day policy {day_policy}")
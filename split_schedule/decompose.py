@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+
+def find_components(student_classes: dict[str, dict[str, dict[int, str]]]) -> list[list[str]]:
+    # Students and sections are joined with union-find. Students are numbered first and each
+    # section gets the next number the first time it is seen.
+    parent = list(range(len(student_classes)))
+    section_ids: dict[tuple[int, str], int] = {}
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for student_id, value in enumerate(student_classes.values()):
+        for section in value["blocks"].items():
+            section_id = section_ids.get(section)
+            if section_id is None:
+                section_id = len(parent)
+                section_ids[section] = section_id
+                parent.append(section_id)
+
+            student_root = find(student_id)
+            section_root = find(section_id)
+            if student_root != section_root:
+                parent[section_root] = student_root
+
+    components: dict[int, list[str]] = {}
+    for student_id, student in enumerate(student_classes):
+        components.setdefault(find(student_id), []).append(student)
+
+    return list(components.values())
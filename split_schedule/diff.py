@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def diff_schedules(old_schedule_df: pd.DataFrame, new_schedule_df: pd.DataFrame) -> pd.DataFrame:
+    for schedule_df in (old_schedule_df, new_schedule_df):
+        if not {"block", "class", "day_number", "student"} <= set(schedule_df.columns):
+            raise ValueError(
+                "The schedules should contain block, class, day_number, and student columns"
+            )
+
+    # Both schedules are coded together so the same student or class has the same code in each
+    total_old = len(old_schedule_df)
+    combined_df = pd.concat(
+        [
+            old_schedule_df[["block", "class", "day_number", "student"]],
+            new_schedule_df[["block", "class", "day_number", "student"]],
+        ],
+        ignore_index=True,
+    )
+    student_codes, students = pd.factorize(combined_df["student"].astype(str))
+    block_codes, blocks = pd.factorize(combined_df["block"])
+    class_codes, classes = pd.factorize(combined_df["class"].astype(str))
+    section_codes = block_codes.astype(np.int64) * len(classes) + class_codes
+    total_sections = max(len(blocks) * len(classes), 1)
+
+    total_students = len(students)
+    days = combined_df["day_number"].to_numpy(dtype=np.int64)
+    old_days = np.zeros(total_students, dtype=np.int64)
+    old_days[student_codes[:total_old]] = days[:total_old]
+    new_days = np.zeros(total_students, dtype=np.int64)
+    new_days[student_codes[total_old:]] = days[total_old:]
+
+    # A student's classes changed when one of their student and class pairs is only in one of the
+    # schedules
+    pairs = student_codes.astype(np.int64) * total_sections + section_codes
+    changed_pairs = np.setxor1d(
+        _sorted_unique(pairs[:total_old]), _sorted_unique(pairs[total_old:]), assume_unique=True
+    )
+    classes_changed = np.zeros(total_students, dtype=bool)
+    classes_changed[changed_pairs // total_sections] = True
+
+    in_old = old_days > 0
+    in_new = new_days > 0
+    in_both = in_old & in_new
+    day_changed = in_both & (old_days != new_days)
+    classes_changed &= in_both
+    changed = ~in_both | day_changed | classes_changed
+
+    return pd.DataFrame(
+        {
+            "student": students[changed],
+            "change": np.select(
+                [~in_old[changed], ~in_new[changed]], ["added", "removed"], default="changed"
+            ),
+            "old_day_number": pd.arrays.IntegerArray(old_days[changed], ~in_old[changed]),
+            "new_day_number": pd.arrays.IntegerArray(new_days[changed], ~in_new[changed]),
+            "day_changed": day_changed[changed],
+            "classes_changed": classes_changed[changed],
+        }
+    ).sort_values("student", ignore_index=True)
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    # Sorting and dropping repeats is faster than np.unique for large integer arrays
+    values = np.sort(values)
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
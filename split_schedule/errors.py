@@ -1,6 +1,29 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from split_schedule.schedule_types import BlockedSection, InputReport, ScheduleViolation
+
+
+class InvalidInputError(ValueError):
+    def __init__(self, message: str, report: Optional[InputReport] = None) -> None:
+        super().__init__(message)
+        self.report = report
+
+
 class NoScheduleError(Exception):
     pass
 
 
 class SchedulingError(Exception):
-    pass
+    def __init__(
+        self, message: str, blocked_sections: Optional[list[BlockedSection]] = None
+    ) -> None:
+        super().__init__(message)
+        self.blocked_sections = blocked_sections or []
+
+
+class InfeasibleScheduleError(SchedulingError):
+    def __init__(self, message: str, violations: Optional[list[ScheduleViolation]] = None) -> None:
+        super().__init__(message)
+        self.violations = violations or []
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import csv
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+ROSTER_GROUPS = {
+    "student": (["student"], ["day_number", "block", "class"]),
+    "class": (["block", "class"], ["day_number", "student"]),
+}
+ROSTER_FORMATS = ("csv", "xlsx", "json")
+
+
+def export_rosters(
+    schedule_df: pd.DataFrame,
+    directory: Union[Path, str],
+    by: str = "student",
+    file_format: str = "csv",
+    workers: int = 1,
+) -> list[Path]:
+    if by not in ROSTER_GROUPS:
+        raise ValueError(f"by should be one of: {', '.join(ROSTER_GROUPS)}")
+
+    if file_format not in ROSTER_FORMATS:
+        raise ValueError(f"file_format should be one of: {', '.join(ROSTER_FORMATS)}")
+
+    group_columns, roster_columns = ROSTER_GROUPS[by]
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # The rows are sorted once by group and then by the roster order so every roster is a slice
+    # of the sorted rows instead of a filter over all of them
+    group_codes, groups = pd.MultiIndex.from_frame(schedule_df[group_columns]).factorize(sort=True)
+    sort_keys = [schedule_df[x].to_numpy() for x in reversed(roster_columns)] + [group_codes]
+    order = np.lexsort(sort_keys)
+    sorted_df = schedule_df[roster_columns].take(order).reset_index(drop=True)
+    bounds = np.searchsorted(group_codes[order], np.arange(len(groups) + 1))
+
+    paths = _roster_paths(directory, groups, "block " if by == "class" else "", file_format)
+    rosters = list(zip(bounds.tolist(), bounds[1:].tolist(), paths))
+
+    # Pandas takes longer to set up each small file than to write it so csv and json rosters are
+    # written from plain rows
+    rows = (
+        [] if file_format == "xlsx" else list(zip(*(sorted_df[x].tolist() for x in roster_columns)))
+    )
+
+    def write(roster: tuple[int, int, Path]) -> None:
+        start, end, path = roster
+        if file_format == "xlsx":
+            sorted_df.iloc[start:end].to_excel(path, index=False, engine="openpyxl")
+        elif file_format == "json":
+            with open(path, "w") as f:
+                json.dump([dict(zip(roster_columns, x)) for x in rows[start:end]], f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(roster_columns)
+                writer.writerows(rows[start:end])
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(write, rosters))
+    else:
+        for roster in rosters:
+            write(roster)
+
+    return paths
+
+
+def _roster_paths(
+    directory: Path, groups: pd.MultiIndex, prefix: str, file_format: str
+) -> list[Path]:
+    paths: list[Path] = []
+    used: set[str] = set()
+    for group in groups:
+        label = prefix + " ".join(str(x) for x in group)
+        name = re.sub(r"[^\w\- ]", "_", label).strip() or "roster"
+
+        # Different names can be the same once cleaned so a number is added to keep them apart
+        unique_name = name
+        suffix = 1
+        while unique_name.lower() in used:
+            suffix += 1
+            unique_name = f"{name} {suffix}"
+        used.add(unique_name.lower())
+
+        paths.append(directory / f"{unique_name}.{file_format}")
+
+    return paths
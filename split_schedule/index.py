@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+
+INDEX_ARRAYS = (
+    "student_names",
+    "student_days",
+    "student_offsets",
+    "student_sections",
+    "section_blocks",
+    "section_classes",
+    "roster_offsets",
+    "roster_students",
+)
+
+
+class ScheduleIndex:
+    __slots__ = INDEX_ARRAYS + ("total_days", "_student_codes", "_section_codes")
+
+    student_names: np.ndarray
+    student_days: np.ndarray
+    student_offsets: np.ndarray
+    student_sections: np.ndarray
+    section_blocks: np.ndarray
+    section_classes: np.ndarray
+    roster_offsets: np.ndarray
+    roster_students: np.ndarray
+    total_days: int
+    _student_codes: dict[str, int]
+    _section_codes: dict[tuple[int, str], int]
+
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        # Students are numbered in name order and sections in block and class order. The sections
+        # of student n are student_sections[student_offsets[n]:student_offsets[n + 1]] and the
+        # students in section s on day d (0-based) are found the same way in roster_students
+        # starting at roster_offsets[s * total_days + d].
+        for name in INDEX_ARRAYS:
+            array = arrays[name]
+            if array.flags.writeable:
+                array = array.view()
+                array.flags.writeable = False
+            object.__setattr__(self, name, array)
+
+        total_sections = len(self.section_blocks)
+        total_days = (len(self.roster_offsets) - 1) // total_sections if total_sections else 0
+        object.__setattr__(self, "total_days", total_days)
+
+        # The dictionaries give constant time lookups by name. They are never changed after this
+        # so the index can be shared between threads.
+        object.__setattr__(
+            self,
+            "_student_codes",
+            {x: i for i, x in enumerate(self.student_names.tolist())},
+        )
+        object.__setattr__(
+            self,
+            "_section_codes",
+            {
+                x: i
+                for i, x in enumerate(
+                    zip(self.section_blocks.tolist(), self.section_classes.tolist())
+                )
+            },
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ScheduleIndex is immutable")
+
+    def __contains__(self, student: object) -> bool:
+        return student in self._student_codes
+
+    def __len__(self) -> int:
+        return len(self.student_names)
+
+    @classmethod
+    def from_columns(
+        cls,
+        block: Sequence[int],
+        class_name: Sequence[str],
+        day_number: Sequence[int],
+        student: Sequence[str],
+    ) -> ScheduleIndex:
+        blocks = np.asarray(block).astype(np.int64)
+        classes = np.asarray(class_name).astype(str)
+        days = np.asarray(day_number).astype(np.int64) - 1
+        students = np.asarray(student).astype(str)
+
+        if len(days) and days.min() < 0:
+            raise ValueError("Day numbers should start at 1")
+
+        student_names, student_codes = np.unique(students, return_inverse=True)
+        student_days = np.zeros(len(student_names), dtype=np.int16)
+        student_days[student_codes] = days + 1
+        if np.any(student_days[student_codes] != days + 1):
+            raise ValueError("Each student should be on a single day")
+
+        section_codes, section_rows = encode_sections(blocks, classes)
+        total_sections = len(section_rows)
+        total_days = int(days.max()) + 1 if len(days) else 0
+
+        student_order = np.lexsort((section_codes, student_codes))
+        roster_keys = section_codes * total_days + days
+        roster_order = np.lexsort((student_codes, roster_keys))
+
+        return cls(
+            {
+                "student_names": student_names,
+                "student_days": student_days,
+                "student_offsets": _offsets(student_codes, len(student_names)),
+                "student_sections": section_codes[student_order],
+                "section_blocks": blocks[section_rows],
+                "section_classes": classes[section_rows],
+                "roster_offsets": _offsets(roster_keys, total_sections * total_days),
+                "roster_students": student_codes[roster_order].astype(np.int64),
+            }
+        )
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {x: getattr(self, x) for x in INDEX_ARRAYS}
+
+    def day(self, student: str) -> int:
+        return int(self.student_days[self._student_codes[student]])
+
+    def roster(self, block: int, class_name: str, day_number: int) -> list[str]:
+        if not 1 <= day_number <= self.total_days:
+            raise KeyError(day_number)
+
+        key = self._section_codes[(block, class_name)] * self.total_days + day_number - 1
+        start, end = self.roster_offsets[key], self.roster_offsets[key + 1]
+        return self.student_names[self.roster_students[start:end]].tolist()
+
+    def sections(self, student: str) -> list[tuple[int, str]]:
+        code = self._student_codes[student]
+        start, end = self.student_offsets[code], self.student_offsets[code + 1]
+        sections = self.student_sections[start:end]
+        return list(
+            zip(self.section_blocks[sections].tolist(), self.section_classes[sections].tolist())
+        )
+
+
+def encode_sections(blocks: np.ndarray, classes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Returns the section code of each row, numbering sections in block and class order, and the
+    # first row of each section
+    order = np.lexsort((classes, blocks))
+    sorted_blocks, sorted_classes = blocks[order], classes[order]
+    new_section = np.ones(len(blocks), dtype=bool)
+    new_section[1:] = (sorted_blocks[1:] != sorted_blocks[:-1]) | (
+        sorted_classes[1:] != sorted_classes[:-1]
+    )
+
+    section_codes = np.empty(len(blocks), dtype=np.int64)
+    section_codes[order] = np.cumsum(new_section) - 1
+
+    return section_codes, order[new_section]
+
+
+def _offsets(codes: np.ndarray, total: int) -> np.ndarray:
+    offsets = np.zeros(total + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=total), out=offsets[1:])
+    return offsets
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import pandas as pd
+
+from split_schedule.errors import InvalidInputError
+from split_schedule.schedule_types import InputConflict, InputReport
+
+SCHEDULE_INPUT_COLUMNS = ["block", "class", "student"]
+
+
+def normalize_schedule(df: pd.DataFrame) -> tuple[pd.DataFrame, InputReport]:
+    missing = [x for x in SCHEDULE_INPUT_COLUMNS if x not in df.columns]
+    if missing:
+        raise InvalidInputError(f"The schedule is missing the columns: {', '.join(missing)}")
+
+    normalized_df = df[SCHEDULE_INPUT_COLUMNS].copy()
+    normalized_df["class"] = _normalize_names(normalized_df["class"])
+    normalized_df["student"] = _normalize_names(normalized_df["student"])
+
+    # Blocks that are not whole numbers are treated the same as missing blocks
+    block = pd.to_numeric(normalized_df["block"], errors="coerce")
+    normalized_df["block"] = block.where(block == block.round())
+
+    null_rows = normalized_df.isna().any(axis=1)
+    normalized_df = normalized_df[~null_rows]
+    duplicate_rows = normalized_df.duplicated()
+    normalized_df = normalized_df[~duplicate_rows].astype(
+        {"block": int, "class": str, "student": str}
+    )
+
+    conflict_df = normalized_df[normalized_df.duplicated(["student", "block"], keep=False)]
+    conflicts: list[InputConflict] = [
+        {"student": student, "block": int(block), "classes": classes}
+        for (student, block), classes in conflict_df.groupby(["student", "block"])["class"]
+        .agg(list)
+        .items()
+    ]
+
+    report: InputReport = {
+        "total_rows": len(df),
+        "null_rows": null_rows[null_rows].index.tolist(),
+        "duplicate_rows": duplicate_rows[duplicate_rows].index.tolist(),
+        "conflicts": conflicts,
+    }
+
+    if conflicts:
+        raise InvalidInputError(
+            f"{len(conflicts)} student and block pairs have more than one class", report
+        )
+
+    if normalized_df.empty:
+        raise InvalidInputError("The schedule does not contain any complete rows", report)
+
+    return normalized_df.reset_index(drop=True), report
+
+
+def integer_id_columns(df: pd.DataFrame) -> list[str]:
+    # Class and student ids are cleaned up as text. Columns that only hold whole numbers are turned
+    # back into numbers in the generated schedule so they still join with the caller's data.
+    return [x for x in ("class", "student") if x in df.columns and _is_integer_ids(df[x])]
+
+
+def restore_id_types(schedule_df: pd.DataFrame, integer_columns: Sequence[str]) -> pd.DataFrame:
+    # Cached schedules can come from a class list with either type of id, so text ids are also
+    # converted back when needed
+    types: dict[str, Any] = {}
+    for column in ("class", "student"):
+        is_integer = pd.api.types.is_integer_dtype(schedule_df[column])
+        if column in integer_columns and not is_integer:
+            types[column] = "int64"
+        elif column not in integer_columns and is_integer:
+            types[column] = str
+
+    return schedule_df.astype(types) if types else schedule_df
+
+
+def normalize_initial_days(initial_schedule: pd.DataFrame) -> dict[str, int]:
+    # Student names are cleaned up the same way as the schedule so a saved schedule read back with
+    # numeric ids still matches
+    initial_df = pd.DataFrame(
+        {
+            "student": _normalize_names(initial_schedule["student"]),
+            "day_number": pd.to_numeric(initial_schedule["day_number"], errors="coerce"),
+        }
+    ).dropna()
+
+    return {
+        str(student): int(day_number) - 1
+        for student, day_number in initial_df.groupby("student")["day_number"].first().items()
+    }
+
+
+def _is_integer_ids(ids: pd.Series) -> bool:
+    if pd.api.types.is_bool_dtype(ids):
+        return False
+
+    if pd.api.types.is_integer_dtype(ids):
+        return True
+
+    ids = ids.dropna()
+    return pd.api.types.is_float_dtype(ids) and not ids.empty and bool((ids % 1 == 0).all())
+
+
+def _normalize_names(names: pd.Series) -> pd.Series:
+    # Whole number ids read as floats because of missing values are written without the decimal
+    if pd.api.types.is_float_dtype(names) and (names.dropna() % 1 == 0).all():
+        names = names.astype("Int64")
+
+    normalized = names.astype("string").str.strip().str.replace(r"\s+", " ", regex=True)
+    return normalized.mask(normalized == "")
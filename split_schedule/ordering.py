@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush
+from typing import Iterator
+
+from split_schedule.sections import Section
+
+ORDERINGS = ("matches", "most_classes", "tightest", "dsatur")
+
+
+def order_students(
+    ordering: str, student_sections: list[list[Section]], total_days: int
+) -> Iterator[int]:
+    if ordering == "most_classes":
+        return iter(sorted(range(len(student_sections)), key=lambda x: -len(student_sections[x])))
+
+    if ordering == "tightest":
+        return iter(
+            sorted(
+                range(len(student_sections)),
+                key=lambda x: (
+                    min(
+                        (
+                            c.max_students * total_days - c.total_students
+                            for c in student_sections[x]
+                        ),
+                        default=0,
+                    ),
+                    -len(student_sections[x]),
+                ),
+            )
+        )
+
+    if ordering == "dsatur":
+        return _dsatur_order(student_sections, total_days)
+
+    raise ValueError(f"Unknown ordering {ordering}")
+
+
+def _dsatur_order(student_sections: list[list[Section]], total_days: int) -> Iterator[int]:
+    # Students are chosen by the fewest days still open to them, ties going to the student with
+    # the most classes. The sections are read again after each student is yielded so the days
+    # filled by the caller's placement are taken into account.
+    section_students: dict[Section, list[int]] = {}
+    for student_code, sections in enumerate(student_sections):
+        for c in sections:
+            section_students.setdefault(c, []).append(student_code)
+
+    full_days = {c: _full_days(c) for c in section_students}
+    blocked_days = [0] * len(student_sections)
+    open_days = [0] * len(student_sections)
+    for student_code, sections in enumerate(student_sections):
+        for c in sections:
+            blocked_days[student_code] |= full_days[c]
+        open_days[student_code] = total_days - bin(blocked_days[student_code]).count("1")
+
+    placed = [False] * len(student_sections)
+    heap = [(open_days[x], -len(y), x) for x, y in enumerate(student_sections)]
+    heapify(heap)
+
+    while heap:
+        days_open, _, student_code = heappop(heap)
+        if placed[student_code] or days_open != open_days[student_code]:
+            continue
+
+        placed[student_code] = True
+        yield student_code
+
+        for c in student_sections[student_code]:
+            newly_full = _full_days(c) & ~full_days[c]
+            if not newly_full:
+                continue
+
+            full_days[c] |= newly_full
+            for other in section_students[c]:
+                if placed[other] or not newly_full & ~blocked_days[other]:
+                    continue
+
+                blocked_days[other] |= newly_full
+                open_days[other] = total_days - bin(blocked_days[other]).count("1")
+                heappush(heap, (open_days[other], -len(student_sections[other]), other))
+
+
+def _full_days(section: Section) -> int:
+    full = 0
+    for day, count in enumerate(section.counts):
+        if count >= section.max_students:
+            full |= 1 << day
+
+    return full
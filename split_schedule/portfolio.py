@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from math import log, sqrt
+from typing import Sequence
+
+from split_schedule.day_policy import DAY_POLICIES
+from split_schedule.ordering import ORDERINGS
+from split_schedule.schedule_types import Strategy, StrategyStats
+
+PORTFOLIO_STRATEGIES: tuple[Strategy, ...] = (
+    {"ordering": "dsatur", "day_policy": "most_room", "backtrack_depth": 0},
+    {"ordering": "matches", "day_policy": "random", "backtrack_depth": 0},
+    {"ordering": "tightest", "day_policy": "most_room", "backtrack_depth": 16},
+    {"ordering": "matches", "day_policy": "most_room", "backtrack_depth": 16},
+    {"ordering": "most_classes", "day_policy": "random", "backtrack_depth": 0},
+)
+
+
+def validate_strategies(strategies: Sequence[Strategy]) -> None:
+    if not strategies:
+        raise ValueError("portfolio should contain at least one strategy")
+
+    for strategy in strategies:
+        if strategy["ordering"] not in ORDERINGS:
+            raise ValueError(f"ordering should be one of: {', '.join(ORDERINGS)}")
+
+        if strategy["day_policy"] not in DAY_POLICIES:
+            raise ValueError(f"day_policy should be one of: {', '.join(DAY_POLICIES)}")
+
+        if strategy["backtrack_depth"] < 0:
+            raise ValueError("backtrack_depth should be 0 or greater")
+
+
+class StrategyPortfolio:
+    def __init__(self, strategies: Sequence[Strategy], exploration: float = 0.2) -> None:
+        validate_strategies(strategies)
+
+        self.strategies = list(strategies)
+        self.exploration = exploration
+        self.tries = [0] * len(self.strategies)
+        self.successes = [0] * len(self.strategies)
+        self.rewards = [0.0] * len(self.strategies)
+
+    def select(self) -> int:
+        # UCB1: every strategy is tried once in order, then the strategy with the best mean reward
+        # plus a bonus that grows for strategies that have not been tried in a while
+        for i, tries in enumerate(self.tries):
+            if tries == 0:
+                return i
+
+        total_tries = sum(self.tries)
+        return max(
+            range(len(self.strategies)),
+            key=lambda x: self.rewards[x] / self.tries[x]
+            + self.exploration * sqrt(2 * log(total_tries) / self.tries[x]),
+        )
+
+    def update(self, index: int, reward: float, succeeded: bool) -> None:
+        self.tries[index] += 1
+        self.rewards[index] += reward
+        if succeeded:
+            self.successes[index] += 1
+
+    def stats(self) -> list[StrategyStats]:
+        return [
+            {
+                **strategy,
+                "tries": tries,
+                "successes": successes,
+                "mean_reward": rewards / tries if tries else 0.0,
+            }
+            for strategy, tries, successes, rewards in zip(
+                self.strategies, self.tries, self.successes, self.rewards
+            )
+        ]
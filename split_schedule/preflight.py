@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from split_schedule.schedule_types import ReducedClass, ScheduleViolation
+
+
+def find_violations(reduced_classes: Sequence[ReducedClass]) -> list[ScheduleViolation]:
+    # The number of days is at least the number of sections of every class, so a class with room
+    # for any students always fits in the days and so does every group of students sharing it.
+    # The only setting that can't be scheduled is a class that allows no students at all.
+    return [
+        {
+            "block": c["block"],
+            "class_name": c["class_name"],
+            "reason": "The class does not allow any students",
+        }
+        for c in reduced_classes
+        if c["max_students"] < 1
+    ]
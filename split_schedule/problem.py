@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from types import TracebackType
+from typing import Optional, Sequence, Type, Union
+
+import numpy as np
+
+from split_schedule.core import ScheduleEngine
+from split_schedule.schedule_types import (
+    ScheduleTotalStudents,
+    SharedArray,
+    SharedProblemHandle,
+    Strategy,
+)
+
+PROBLEM_ARRAYS = (
+    "student_names",
+    "section_blocks",
+    "section_classes",
+    "section_totals",
+    "student_offsets",
+    "student_sections",
+)
+
+PROBLEM_FORMAT_VERSION = 1
+
+
+class EncodedProblem:
+    __slots__ = PROBLEM_ARRAYS + ("_shared_memory",)
+
+    def __init__(
+        self,
+        arrays: dict[str, np.ndarray],
+        shared: Optional[SharedMemory] = None,
+    ) -> None:
+        # Students and sections are numbered in the order the engine uses, sections sorted by
+        # block and class and students by their first section. The sections of student n are
+        # student_sections[student_offsets[n]:student_offsets[n + 1]].
+        self.student_names = arrays["student_names"]
+        self.section_blocks = arrays["section_blocks"]
+        self.section_classes = arrays["section_classes"]
+        self.section_totals = arrays["section_totals"]
+        self.student_offsets = arrays["student_offsets"]
+        self.student_sections = arrays["student_sections"]
+
+        # Attached arrays are views of the shared memory so it is kept open as long as they are
+        self._shared_memory = shared
+
+    @classmethod
+    def from_columns(
+        cls, block: Sequence[int], class_name: Sequence[str], student: Sequence[str]
+    ) -> EncodedProblem:
+        blocks = np.asarray(block).astype(np.int64)
+        classes = np.asarray(class_name).astype(str)
+        students = np.asarray(student).astype(str)
+
+        order = np.lexsort((classes, blocks))
+        blocks, classes, students = blocks[order], classes[order], students[order]
+
+        new_section = np.ones(len(blocks), dtype=bool)
+        new_section[1:] = (blocks[1:] != blocks[:-1]) | (classes[1:] != classes[:-1])
+        section_codes = np.cumsum(new_section) - 1
+
+        unique_students, first_rows, inverse = np.unique(
+            students, return_index=True, return_inverse=True
+        )
+        appearance = np.argsort(first_rows, kind="stable")
+        student_ranks = np.empty_like(appearance)
+        student_ranks[appearance] = np.arange(len(appearance))
+        student_codes = student_ranks[inverse]
+
+        membership = np.lexsort((section_codes, student_codes))
+        student_offsets = np.zeros(len(unique_students) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(student_codes, minlength=len(unique_students)), out=student_offsets[1:]
+        )
+
+        return cls(
+            {
+                "student_names": unique_students[appearance],
+                "section_blocks": blocks[new_section],
+                "section_classes": classes[new_section],
+                "section_totals": np.bincount(section_codes).astype(np.int64),
+                "student_offsets": student_offsets,
+                "student_sections": section_codes[membership].astype(np.int64),
+            }
+        )
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {x: getattr(self, x) for x in PROBLEM_ARRAYS}
+
+    def columns(self) -> dict[str, np.ndarray]:
+        student_codes = np.repeat(np.arange(len(self.student_names)), np.diff(self.student_offsets))
+
+        return {
+            "block": self.section_blocks[self.student_sections],
+            "class": self.section_classes[self.student_sections],
+            "student": self.student_names[student_codes],
+        }
+
+    def class_sizes(self) -> list[ScheduleTotalStudents]:
+        return [
+            {"block": block, "class_name": class_name, "total_students": total_students}
+            for block, class_name, total_students in zip(
+                self.section_blocks.tolist(),
+                self.section_classes.tolist(),
+                self.section_totals.tolist(),
+            )
+        ]
+
+    def student_classes(self) -> dict[str, dict[str, dict[int, str]]]:
+        blocks = self.section_blocks.tolist()
+        classes = self.section_classes.tolist()
+        offsets = self.student_offsets.tolist()
+        sections = self.student_sections.tolist()
+
+        student_classes: dict[str, dict[str, dict[int, str]]] = {}
+        for code, student in enumerate(self.student_names.tolist()):
+            start, end = offsets[code], offsets[code + 1]
+            student_classes[student] = {
+                "blocks": {blocks[x]: classes[x] for x in sections[start:end]}
+            }
+
+        return student_classes
+
+
+class SharedProblem:
+    def __init__(self, problem: EncodedProblem) -> None:
+        arrays: list[SharedArray] = []
+        size = 0
+        for name, array in problem.arrays().items():
+            # Each array starts on an 8 byte boundary so the views are aligned
+            size += -size % 8
+            arrays.append(
+                {"name": name, "dtype": array.dtype.str, "shape": list(array.shape), "offset": size}
+            )
+            size += array.nbytes
+
+        self._shared_memory = SharedMemory(create=True, size=max(size, 1))
+        for shared_array, array in zip(arrays, problem.arrays().values()):
+            _shared_view(self._shared_memory, shared_array)[...] = array
+
+        self.handle: SharedProblemHandle = {
+            "shared_memory_name": self._shared_memory.name,
+            "arrays": arrays,
+        }
+
+    def __enter__(self) -> SharedProblem:
+        return self
+
+    def __exit__(
+        self,
+        et: Optional[Type[BaseException]],
+        ev: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+
+
+def build_assignment(
+    problem: Union[EncodedProblem, SharedProblemHandle],
+    reduce_by: float = 0.2,
+    smallest_allowed: int = 1,
+    max_tries: int = 10,
+    ordering: str = "matches",
+    day_policy: str = "random",
+    backtrack_depth: int = 0,
+    portfolio: Optional[Sequence[Strategy]] = None,
+) -> np.ndarray:
+    if not isinstance(problem, EncodedProblem):
+        problem = attach_problem(problem)
+
+    schedule_engine = ScheduleEngine(
+        ordering=ordering,
+        day_policy=day_policy,
+        backtrack_depth=backtrack_depth,
+        portfolio=portfolio,
+    )
+    schedule_engine._set_problem(problem)
+    fill_classes = schedule_engine._build_fill_classes(reduce_by, smallest_allowed, max_tries)
+
+    return np.array(
+        schedule_engine._fill_days(fill_classes, len(problem.student_names)), dtype=np.int16
+    )
+
+
+def attach_problem(handle: SharedProblemHandle) -> EncodedProblem:
+    attached = SharedMemory(name=handle["shared_memory_name"])
+
+    return EncodedProblem(
+        {x["name"]: _shared_view(attached, x) for x in handle["arrays"]}, attached
+    )
+
+
+def load_problem(problem_path: Union[Path, str]) -> EncodedProblem:
+    problem_path = Path(problem_path)
+    try:
+        header = json.loads((problem_path / "header.json").read_text())
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No problem has been saved to {problem_path}") from None
+
+    if header.get("version") != PROBLEM_FORMAT_VERSION:
+        raise ValueError(f"Unsupported problem format version {header.get('version')}")
+
+    arrays: dict[str, np.ndarray] = {}
+    for name in PROBLEM_ARRAYS:
+        # The arrays are mapped rather than read so processes loading the same problem share the
+        # pages and only the parts used are read from disk
+        array = np.load(problem_path / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+        if array.dtype.str != header["arrays"][name]["dtype"] or list(array.shape) != list(
+            header["arrays"][name]["shape"]
+        ):
+            raise ValueError(f"The {name} array does not match the problem header")
+
+        arrays[name] = array
+
+    return EncodedProblem(arrays)
+
+
+def save_problem(problem: EncodedProblem, problem_path: Union[Path, str]) -> None:
+    problem_path = Path(problem_path)
+    problem_path.mkdir(parents=True, exist_ok=True)
+
+    for name, array in problem.arrays().items():
+        np.save(problem_path / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+
+    # The header is written last so a directory with a header always has all of its arrays
+    header = {
+        "version": PROBLEM_FORMAT_VERSION,
+        "arrays": {
+            name: {"dtype": array.dtype.str, "shape": list(array.shape)}
+            for name, array in problem.arrays().items()
+        },
+    }
+    (problem_path / "header.json").write_text(json.dumps(header))
+
+
+def _shared_view(shared: SharedMemory, shared_array: SharedArray) -> np.ndarray:
+    return np.ndarray(
+        tuple(shared_array["shape"]),
+        dtype=np.dtype(shared_array["dtype"]),
+        buffer=shared.buf,
+        offset=shared_array["offset"],
+    )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from split_schedule.schedule_types import MemoryStats
+
+
+class MemoryProfiler:
+    def __init__(self) -> None:
+        self.stats: list[MemoryStats] = []
+        self._started = False
+
+        # Each open phase keeps the traced memory when it started, the highest peak seen so far, and
+        # the tracemalloc peak when it started. A tracemalloc peak only belongs to the phase if it is
+        # above that starting peak.
+        self._phases: list[list[int]] = []
+
+    def start(self) -> None:
+        self.stats = []
+        self._phases = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+
+    def stop(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextmanager
+    def phase(self, name: str, attempt: Optional[int] = None) -> Iterator[None]:
+        current, peak = tracemalloc.get_traced_memory()
+        self._record_peak(peak)
+
+        # tracemalloc.reset_peak was added in Python 3.9. Without it the peak is never lowered, so a
+        # phase only sees its own peak when it goes above every earlier peak.
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+            peak = current
+        self._phases.append([current, current, peak])
+
+        try:
+            yield
+        finally:
+            end_current, end_peak = tracemalloc.get_traced_memory()
+            self._record_peak(end_peak)
+            start, peak, _ = self._phases.pop()
+            peak = max(peak, end_current)
+            if self._phases:
+                self._phases[-1][1] = max(self._phases[-1][1], peak)
+
+            self.stats.append(
+                {
+                    "attempt": attempt,
+                    "phase": name,
+                    "peak_bytes": peak - start,
+                    "net_bytes": end_current - start,
+                }
+            )
+
+    def _record_peak(self, peak: int) -> None:
+        if self._phases and peak > self._phases[-1][2]:
+            self._phases[-1][1] = max(self._phases[-1][1], peak)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from split_schedule.schedule_types import ScheduleReport
+
+
+def build_report(schedule_df: pd.DataFrame) -> ScheduleReport:
+    # Every count is a bincount over integer codes so the report is one pass over the rows no
+    # matter how many sections, days, or students there are
+    section_codes, sections = pd.MultiIndex.from_frame(schedule_df[["block", "class"]]).factorize(
+        sort=True
+    )
+    block_codes, blocks = pd.factorize(sections.get_level_values(0), sort=True)
+    student_codes, students = pd.factorize(schedule_df["student"], sort=True)
+    days = schedule_df["day_number"].to_numpy(dtype=np.int64) - 1
+
+    total_sections = len(sections)
+    total_blocks = len(blocks)
+    total_days = int(days.max()) + 1 if len(days) else 0
+
+    max_students = np.zeros(total_sections, dtype=np.int64)
+    max_students[section_codes] = schedule_df["max_students"].to_numpy(dtype=np.int64)
+
+    section_counts = np.bincount(
+        section_codes * total_days + days, minlength=total_sections * total_days
+    ).reshape(total_sections, total_days)
+    fill_ratios = section_counts / np.maximum(max_students, 1)[:, None]
+
+    block_counts = np.bincount(
+        block_codes[section_codes] * total_days + days, minlength=total_blocks * total_days
+    ).reshape(total_blocks, total_days)
+    block_capacity = np.bincount(block_codes, weights=max_students, minlength=total_blocks)
+
+    student_days = np.zeros(len(students), dtype=np.int64)
+    student_days[student_codes] = days
+    day_students = np.bincount(student_days, minlength=total_days)
+    day_capacity = max_students.sum()
+    day_enrollments = section_counts.sum(axis=0)
+
+    sections_df = pd.DataFrame(
+        {
+            "block": np.repeat(sections.get_level_values(0), total_days),
+            "class": np.repeat(sections.get_level_values(1), total_days),
+            "day_number": np.tile(np.arange(1, total_days + 1), total_sections),
+            "students": section_counts.ravel(),
+            "max_students": np.repeat(max_students, total_days),
+            "fill_ratio": fill_ratios.ravel(),
+        }
+    )
+    days_df = pd.DataFrame(
+        {
+            "day_number": np.arange(1, total_days + 1),
+            "students": day_students,
+            "enrollments": day_enrollments,
+            "capacity": day_capacity,
+            "utilization": day_enrollments / max(day_capacity, 1),
+        }
+    )
+    blocks_df = pd.DataFrame(
+        {
+            "block": np.repeat(blocks, total_days),
+            "day_number": np.tile(np.arange(1, total_days + 1), total_blocks),
+            "students": block_counts.ravel(),
+            "capacity": np.repeat(block_capacity.astype(np.int64), total_days),
+            "utilization": (block_counts / np.maximum(block_capacity, 1)[:, None]).ravel(),
+        }
+    )
+    students_df = pd.DataFrame(
+        {
+            "student": students,
+            "day_number": student_days + 1,
+            "classes": np.bincount(student_codes, minlength=len(students)),
+        }
+    )
+
+    has_rows = total_sections > 0 and total_days > 0
+    day_mean = day_students.mean() if total_days else 0.0
+
+    return {
+        "sections": sections_df,
+        "days": days_df,
+        "blocks": blocks_df,
+        "students": students_df,
+        "imbalance": {
+            "day_student_spread": int(np.ptp(day_students)) if total_days else 0,
+            "day_student_cv": float(day_students.std() / day_mean) if day_mean else 0.0,
+            "max_section_spread": int(np.ptp(section_counts, axis=1).max()) if has_rows else 0,
+            "mean_fill_ratio": float(fill_ratios.mean()) if has_rows else 0.0,
+            "max_fill_ratio": float(fill_ratios.max()) if has_rows else 0.0,
+            "overfull_sections": int((section_counts > max_students[:, None]).sum()),
+        },
+    }
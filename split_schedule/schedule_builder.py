@@ -1,31 +1,74 @@
 from __future__ import annotations
 
-import logging
-from itertools import combinations
-from math import ceil, floor
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-from random import randrange
-from typing import Optional, Union
+from typing import Any, Callable, Iterator, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
 
-from split_schedule.errors import NoScheduleError, SchedulingError
-from split_schedule.schedule_types import ReducedClass, ScheduleDays, ScheduleTotalStudents
-
+from split_schedule.cache import InputCache, ResultCache, make_cache_key
+from split_schedule.core import SCHEDULE_COLUMNS, ScheduleEngine
+from split_schedule.decompose import find_components
+from split_schedule.errors import InvalidInputError, NoScheduleError, SchedulingError
+from split_schedule.export import export_rosters
+from split_schedule.index import ScheduleIndex
+from split_schedule.normalize import (
+    integer_id_columns,
+    normalize_initial_days,
+    normalize_schedule,
+    restore_id_types,
+)
+from split_schedule.problem import EncodedProblem, load_problem, save_problem
+from split_schedule.profiling import MemoryProfiler
+from split_schedule.report import build_report
+from split_schedule.schedule_types import InputReport, ScheduleReport, Strategy
+from split_schedule.sections import Section
+from split_schedule.snapshot import load_snapshot, save_snapshot
+
+
+class ScheduleBuilder(ScheduleEngine):
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        limiter: Optional[asyncio.Semaphore] = None,
+        cache: Optional[ResultCache] = None,
+        input_cache: Optional[InputCache] = None,
+        ordering: str = "matches",
+        day_policy: str = "random",
+        decompose: bool = False,
+        workers: int = 1,
+        profile_memory: bool = False,
+        backtrack_depth: int = 0,
+        portfolio: Optional[Sequence[Strategy]] = None,
+    ) -> None:
+        super().__init__(
+            ordering=ordering,
+            day_policy=day_policy,
+            backtrack_depth=backtrack_depth,
+            portfolio=portfolio,
+        )
 
-class ScheduleBuilder:
-    def __init__(self) -> None:
         self.final_schedule_df: Optional[pd.DataFrame] = None
+        self.memory_stats_df: Optional[pd.DataFrame] = None
+        self.input_report: Optional[InputReport] = None
 
         self._schedule_df: pd.DataFrame = pd.DataFrame(columns=["block", "class", "student"])
-        self._attempted_df: list[pd.DataFrame] = []
-        self._attempt: int = 1
-        self._verbose: bool = False
-
-        logging.basicConfig(format="%(asctime)s: %(levelname)s: %(message)s")
-        logging.root.setLevel(level=logging.INFO)
-        self._logger = logging.getLogger()
+        self._executor = executor
+        self._limiter = limiter
+        self._cache = cache
+        self._input_cache = input_cache
+        self._integer_ids: list[str] = []
+        self._decompose = decompose
+        self._workers = workers
+        self._memory_profiler = MemoryProfiler() if profile_memory else None
+        # Each async call gets its own cancel event, set on the thread running the build
+        self._cancel_events = threading.local()
+        self._build_params: dict[str, Any] = {}
 
     def build_schedule_from_df(
         self,
@@ -34,10 +77,13 @@ class ScheduleBuilder:
         smallest_allowed: int = 1,
         max_tries: int = 10,
         verbose: bool = False,
+        initial_schedule: Optional[pd.DataFrame] = None,
     ) -> None:
-        self._schedule_df = df
-        self._verbose = verbose
-        self._build_schedule(reduce_by, smallest_allowed, max_tries)
+        with self._profile_memory():
+            self._set_verbose(verbose)
+            self._set_schedule_df(self._normalize_schedule_df(df))
+            self._set_initial_schedule(initial_schedule)
+            self._build_cached_schedule(reduce_by, smallest_allowed, max_tries)
 
     def build_schedule_from_file(
         self,
@@ -46,20 +92,158 @@ class ScheduleBuilder:
         smallest_allowed: int = 1,
         max_tries: int = 10,
         verbose: bool = False,
+        initial_schedule: Optional[pd.DataFrame] = None,
     ) -> None:
-        file_path = (
-            Path(schedule_file_path) if isinstance(schedule_file_path, str) else schedule_file_path
-        )
+        with self._profile_memory():
+            self._set_verbose(verbose)
+            self._set_schedule_df(
+                self._normalize_schedule_df(self._read_schedule_file(schedule_file_path))
+            )
+            self._set_initial_schedule(initial_schedule)
+            self._build_cached_schedule(reduce_by, smallest_allowed, max_tries)
 
-        if file_path.suffix == ".xlsx":
-            self._schedule_df = pd.read_excel(file_path)
-        elif file_path.suffix == ".csv":
-            self._schedule_df = pd.read_csv(file_path)
+    def build_schedule_from_problem(
+        self,
+        problem_path: Union[Path, str],
+        reduce_by: float = 0.2,
+        smallest_allowed: int = 1,
+        max_tries: int = 10,
+        verbose: bool = False,
+        initial_schedule: Optional[pd.DataFrame] = None,
+    ) -> None:
+        with self._profile_memory():
+            self._set_verbose(verbose)
+            self.load_problem(problem_path)
+            self._set_initial_schedule(initial_schedule)
+            self._build_cached_schedule(reduce_by, smallest_allowed, max_tries)
+
+    async def abuild_schedule_from_df(
+        self,
+        df: pd.DataFrame,
+        reduce_by: float = 0.2,
+        smallest_allowed: int = 1,
+        max_tries: int = 10,
+        verbose: bool = False,
+        initial_schedule: Optional[pd.DataFrame] = None,
+    ) -> None:
+        if isinstance(self._executor, ProcessPoolExecutor):
+            await self._abuild_in_process(
+                df, reduce_by, smallest_allowed, max_tries, verbose, initial_schedule
+            )
         else:
-            raise ValueError("File should either be an xlsx Excel or a csv file")
+            await self._run_async(
+                self.build_schedule_from_df,
+                df,
+                reduce_by,
+                smallest_allowed,
+                max_tries,
+                verbose,
+                initial_schedule,
+            )
+
+    async def abuild_schedule_from_file(
+        self,
+        schedule_file_path: Union[Path, str],
+        reduce_by: float = 0.2,
+        smallest_allowed: int = 1,
+        max_tries: int = 10,
+        verbose: bool = False,
+        initial_schedule: Optional[pd.DataFrame] = None,
+    ) -> None:
+        if isinstance(self._executor, ProcessPoolExecutor):
+            await self._abuild_in_process(
+                schedule_file_path,
+                reduce_by,
+                smallest_allowed,
+                max_tries,
+                verbose,
+                initial_schedule,
+            )
+        else:
+            await self._run_async(
+                self.build_schedule_from_file,
+                schedule_file_path,
+                reduce_by,
+                smallest_allowed,
+                max_tries,
+                verbose,
+                initial_schedule,
+            )
+
+    async def asave_schedule(self, save_path: Union[Path, str]) -> None:
+        if self.final_schedule_df is None:
+            raise NoScheduleError("No schedule has been generated")
+
+        if isinstance(self._executor, ProcessPoolExecutor):
+            await self._run_async(_save_schedule_worker, self.final_schedule_df, save_path)
+        else:
+            await self._run_async(self.save_schedule, save_path)
+
+    def export_problem(self, problem_path: Union[Path, str]) -> None:
+        if self._schedule_df.empty:
+            raise ValueError("No class list has been loaded")
+
+        if self._verbose:
+            self._logger.info(f"Saving problem to {problem_path}")
+
+        save_problem(
+            EncodedProblem.from_columns(
+                self._schedule_df["block"], self._schedule_df["class"], self._schedule_df["student"]
+            ),
+            problem_path,
+        )
+
+    def load_problem(self, problem_path: Union[Path, str]) -> None:
+        if self._verbose:
+            self._logger.info(f"Loading problem from {problem_path}")
 
-        self._verbose = verbose
-        self._build_schedule(reduce_by, smallest_allowed, max_tries)
+        problem = load_problem(problem_path)
+        self.input_report = None
+        self._integer_ids = []
+        self._set_schedule_df(pd.DataFrame(problem.columns()))
+        self._set_problem(problem)
+
+    def load_snapshot(self, snapshot_path: Union[Path, str]) -> None:
+        if self._verbose:
+            self._logger.info(f"Loading snapshot from {snapshot_path}")
+
+        snapshot = load_snapshot(snapshot_path)
+        self._build_params = snapshot.params
+        self.final_schedule_df = pd.DataFrame(snapshot.columns()).sort_values(
+            by=["day_number", "block", "class"], ignore_index=True
+        )
+
+    def report(self) -> ScheduleReport:
+        if self.final_schedule_df is None:
+            raise NoScheduleError("No schedule has been generated")
+
+        return build_report(self.final_schedule_df)
+
+    def save_rosters(
+        self,
+        directory: Union[Path, str],
+        by: str = "student",
+        file_format: str = "csv",
+        workers: int = 1,
+    ) -> list[Path]:
+        if self.final_schedule_df is None:
+            raise NoScheduleError("No schedule has been generated")
+
+        if self._verbose:
+            self._logger.info(f"Saving {by} rosters to {directory}")
+
+        return export_rosters(self.final_schedule_df, directory, by, file_format, workers)
+
+    def save_snapshot(self, save_path: Union[Path, str]) -> None:
+        if self.final_schedule_df is None:
+            raise NoScheduleError("No schedule has been generated")
+
+        if self._verbose:
+            self._logger.info(f"Saving snapshot to {save_path}")
+
+        save_snapshot(
+            {x: self.final_schedule_df[x] for x in SCHEDULE_COLUMNS}, save_path, self._build_params
+        )
 
     def save_schedule(self, save_path: Union[Path, str]) -> None:
         if self.final_schedule_df is None:
@@ -80,13 +264,92 @@ class ScheduleBuilder:
         if self._verbose:
             self._logger.info("Saving schedule complete")
 
+    def schedule_index(self) -> ScheduleIndex:
+        if self.final_schedule_df is None:
+            raise NoScheduleError("No schedule has been generated")
+
+        return ScheduleIndex.from_columns(
+            self.final_schedule_df["block"],
+            self.final_schedule_df["class"],
+            self.final_schedule_df["day_number"],
+            self.final_schedule_df["student"],
+        )
+
+    async def _abuild_in_process(
+        self,
+        schedule: Union[pd.DataFrame, Path, str],
+        reduce_by: float,
+        smallest_allowed: int,
+        max_tries: int,
+        verbose: bool,
+        initial_schedule: Optional[pd.DataFrame],
+    ) -> None:
+        # Reading, cleaning up, and hashing the class list are run in the pool and the rest of the
+        # work that touches every row is run in a thread, so the event loop is never blocked. The
+        # builder is only changed while the limiter is held.
+        async with self._get_limiter():
+            self._set_verbose(verbose)
+            try:
+                schedule_df, self.input_report, self._integer_ids, initial_days, cache_key = (
+                    await self._run_in_executor(
+                        _prepare_schedule_worker,
+                        schedule,
+                        reduce_by,
+                        smallest_allowed,
+                        verbose,
+                        self._build_options(),
+                        self._input_cache,
+                        initial_schedule,
+                        self._cache is not None,
+                    )
+                )
+            except InvalidInputError as e:
+                self.input_report = e.report
+                raise
+
+            await self._run_in_thread(self._set_schedule_df, schedule_df)
+            self._initial_days = initial_days
+            self._set_build_params(reduce_by, smallest_allowed)
+
+            self.final_schedule_df = None
+            if self._cache is not None and cache_key is not None:
+                self.final_schedule_df = await self._run_in_thread(self._cache.get, cache_key)
+
+            if self.final_schedule_df is not None:
+                if self._verbose:
+                    self._logger.info("Schedule found in cache")
+            else:
+                self.final_schedule_df = await self._run_in_executor(
+                    _build_schedule_from_df_worker,
+                    schedule_df,
+                    reduce_by,
+                    smallest_allowed,
+                    max_tries,
+                    verbose,
+                    self._build_options(),
+                    initial_days,
+                )
+
+                if self._cache is not None and cache_key is not None:
+                    await self._run_in_thread(self._cache.set, cache_key, self.final_schedule_df)
+
+            if self.final_schedule_df is not None:
+                self.final_schedule_df = await self._run_in_thread(
+                    restore_id_types, self.final_schedule_df, self._integer_ids
+                )
+
     def _build_schedule(
         self, reduce_by: float, smallest_allowed: int = 1, max_tries: int = 10
     ) -> None:
+        cancel_event = getattr(self._cancel_events, "current", None)
+        if cancel_event is not None and cancel_event.is_set():
+            raise SchedulingError("Schedule build cancelled")
+
         if self._verbose:
             self._logger.info("Getting student classes")
 
-        student_classes_grouped = self._get_student_classes()
+        with self._memory_phase("student_classes"):
+            student_classes_grouped = self._get_cached_student_classes()
 
         if self._verbose:
             self._logger.info("Getting student classes complete")
@@ -94,11 +357,29 @@ class ScheduleBuilder:
         if self._verbose:
             self._logger.info("Initalizing classes")
 
-        classes = self._init_classes(reduce_by, smallest_allowed)
+        with self._memory_phase("init_classes"):
+            classes = self._init_classes(reduce_by, smallest_allowed)
 
         if self._verbose:
             self._logger.info("Initalizing classes complete")
 
+        if self._attempt == 1:
+            with self._memory_phase("feasibility"):
+                self._check_feasibility(reduce_by, smallest_allowed)
+
+            if self._decompose:
+                components = find_components(student_classes_grouped)
+                if len(components) > 1:
+                    with self._memory_phase("components"):
+                        self._build_components(
+                            components,
+                            reduce_by,
+                            smallest_allowed,
+                            max_tries,
+                            len(classes[0].rosters),
+                        )
+                    return
+
         if self._verbose:
             self._logger.info("Getting class sizes")
 
@@ -123,10 +404,11 @@ class ScheduleBuilder:
         if self._verbose:
             self._logger.info("Filling blocks")
 
-        fill_classes = self._fill_classes(
-            classes,
-            student_classes_grouped,
-        )
+        with self._memory_phase("fill_classes"):
+            fill_classes = self._fill_attempt(
+                classes,
+                student_classes_grouped,
+            )
 
         if self._verbose:
             self._logger.info("Filling blocks complete")
@@ -135,7 +417,10 @@ class ScheduleBuilder:
             if self._verbose:
                 self._logger.info("Formatting classes")
 
-            fill_class_df = self._expand_fill_classes(fill_classes)
+            with self._memory_phase("expand_classes"):
+                fill_class_df = self._expand_fill_classes(
+                    fill_classes, list(student_classes_grouped)
+                )
 
             if self._verbose:
                 self._logger.info("Formatting classes complete")
@@ -143,7 +428,7 @@ class ScheduleBuilder:
             self._validate_generated_schedule(fill_class_df, reduce_by, smallest_allowed, max_tries)
         else:
             if self._attempt >= max_tries:
-                raise SchedulingError("No possible schedule found")
+                self._raise_no_schedule()
 
             if self._verbose:
                 self._logger.info("No schedule found. Retrying")
@@ -151,274 +436,222 @@ class ScheduleBuilder:
             self._attempt += 1
             self._build_schedule(reduce_by, smallest_allowed, max_tries)
 
-    def _expand_fill_classes(self, fill_classes: list[ScheduleDays]) -> pd.DataFrame:
-        fill_classes_expanded = []
-        for fill in fill_classes:
-            for i, c in enumerate(fill["classes"]):
-                for student in c:
-                    row = {
-                        "block": fill["block"],
-                        "class_name": fill["class_name"],
-                        "total_students": fill["total_students"],
-                        "max_students": fill["max_students"],
-                        "num_classes": fill["num_classes"],
-                        "day_number": i + 1,
-                        "student": student,
-                    }
-                    fill_classes_expanded.append(row)
-
-        fill_class_df = pd.DataFrame(fill_classes_expanded)
-        fill_class_df = fill_class_df.rename(columns={"class_name": "class"})
-
-        return fill_class_df
-
-    def _fill_classes(
+    def _build_components(
         self,
-        fill_classes: list[ScheduleDays],
-        student_classes_grouped: dict[str, dict[str, dict[int, str]]],
-    ) -> Optional[list[ScheduleDays]]:
-        matches = self._find_matches()
-        students_added = set()
-
-        total_days = len(fill_classes[0]["classes"])
-
-        for match in matches:
-            for m in match.values():
-                for people in m:
-                    day = randrange(total_days)
-                    for person in people:
-                        if person not in students_added:
-                            day_tried = day
-                            days: list[int] = []
-                            to_add = []
-                            while len(days) < total_days:
-                                for c in fill_classes:
-                                    if (
-                                        c["class_name"]
-                                        == student_classes_grouped[person]["blocks"].get(c["block"])
-                                        and len(c["classes"][day_tried]) < c["max_students"]
-                                    ):
-                                        add = {
-                                            "student": person,
-                                            "block": c["block"],
-                                            "class_name": c["class_name"],
-                                            "class_day": day_tried,
-                                        }
-                                        if add not in to_add:
-                                            to_add.append(add)
-                                if len(to_add) == len(student_classes_grouped[person]["blocks"]):
-                                    break
-
-                                to_add = []
-                                days.append(day_tried)
-                                for i in range(total_days):
-                                    if i not in days:
-                                        day_tried = i
-                                        break
-
-                            if len(to_add) != len(student_classes_grouped[person]["blocks"]):
-                                return None
-
-                            for a in to_add:
-                                for c in fill_classes:
-                                    if (
-                                        c["block"] == a["block"]
-                                        and c["class_name"] == a["class_name"]
-                                        and len(c["classes"][day_tried]) < c["max_students"]
-                                    ):
-                                        c["classes"][a["class_day"]].add(  # type: ignore
-                                            a["student"]
-                                        )
-                            students_added.add(person)
-        day = randrange(total_days)
-        for student_name, value in student_classes_grouped.items():
-            if student_name not in students_added:
-                day_tried = day
-                days = []
-                to_add = []
-                while len(days) < total_days:
-                    for c in fill_classes:
-                        if (
-                            c["class_name"]
-                            == student_classes_grouped[student_name]["blocks"].get(c["block"])
-                            and len(c["classes"][day_tried]) < c["max_students"]
-                        ):
-                            add = {
-                                "student": student_name,
-                                "block": c["block"],
-                                "class_name": c["class_name"],
-                                "class_day": day_tried,
-                            }
-                            if add not in to_add:
-                                to_add.append(add)
-                    if len(to_add) == len(value["blocks"]):
-                        break
-
-                    to_add = []
-                    days.append(day_tried)
-                    for i in range(total_days):
-                        if i not in days:
-                            day_tried = i
-                            break
-                if len(to_add) != len(student_classes_grouped[student_name]["blocks"]):
-                    return None
-
-                for a in to_add:
-                    for c in fill_classes:
-                        if (
-                            c["block"] == a["block"]
-                            and c["class_name"] == a["class_name"]
-                            and len(c["classes"][day_tried]) < c["max_students"]
-                        ):
-                            c["classes"][a["class_day"]].add(a["student"])  # type: ignore
-                students_added.add(student_name)
-        return fill_classes
-
-    def _find_matches(self) -> list[dict[int, list[list[str]]]]:
-        blocks = self._schedule_df["block"].sort_values().unique()
-        total_blocks = self._schedule_df["block"].max()
-        match_df = self._schedule_df.pivot(
-            index="student", columns="block", values="class"
-        ).reset_index()
-
-        if len(self._attempted_df) == 0:
-            self._attempted_df.append(match_df)
-        else:
-            if self._verbose:
-                self._logger.info("Finding unused student order")
-
-            total_attempted_pre = len(self._attempted_df)
-            total_attempted = len(self._attempted_df)
-            attempt_number = 1
-            while False in [match_df.equals(x) for x in self._attempted_df]:
-                self._attempted_df.append(match_df)
-                match_df = match_df.sample(frac=1)
-                if attempt_number == total_attempted:
-                    if self._verbose:
-                        self._logger.info("No unused matches found")
-                    break
-                attempt_number += 1
-
-            if self._verbose:
-                if len(self._attempted_df) <= total_attempted_pre:
-                    self._logger.info("No unused matches found")
-                else:
-                    self._logger.info("Unused student order found")
-
-        matches: list[dict[int, list[list[str]]]] = []
-        for i in range(total_blocks, 1, -1):
-            matches.append({i: []})
-
-        all_combinations = []
-        for r in range(len(blocks) + 1):
-            found_combinations = combinations(blocks, r)
-            combinations_list = list(found_combinations)
-            for comb in combinations_list:
-                if len(comb) > 1:
-                    all_combinations += combinations_list
-
-        all_combinations.sort(reverse=True, key=len)
-
-        for comb in all_combinations:
-            exclude = []
-            for match in matches:
-                for m in match:
-                    for student_matches in match[m]:
-                        for student_match in student_matches:
-                            exclude.append(student_match)
-
-            match_df = match_df[~match_df["student"].isin(exclude)]
-            matches_key = len(comb)
-            matches_loc = total_blocks - len(comb)
-            match_some_df = match_df.groupby(list(comb))
-            for match in match_some_df:
-                match_list = match[1][["student"]].values.tolist()  # type: ignore
-                check = [x.pop() for x in match_list if len(match_list) > 1]
-                if check:
-                    matches[matches_loc][matches_key].append(check)
-
-        return matches
-
-    def _get_class_size(self) -> list[ScheduleTotalStudents]:
-        class_size = (
-            self._schedule_df.groupby(
-                [
-                    "block",
-                    "class",
-                ]
-            )
-            .size()
-            .to_frame()
-            .reset_index()
-        )
-        return [
-            {"block": x[0], "class_name": x[1], "total_students": x[2]}
-            for x in class_size.to_numpy()
+        components: list[list[str]],
+        reduce_by: float,
+        smallest_allowed: int,
+        max_tries: int,
+        total_days: int,
+    ) -> None:
+        if self._verbose:
+            self._logger.info(f"Building {len(components)} independent groups of students")
+
+        student_component = {
+            student: i for i, component in enumerate(components) for student in component
+        }
+        # Each group's rows are looked up by its position in components so they line up with the
+        # group's initial days
+        grouped = self._schedule_df.groupby(self._schedule_df["student"].map(student_component))
+        component_dfs = [grouped.get_group(i) for i in range(len(components))]
+        build_options = {**self._build_options(), "decompose": False}
+        args = (reduce_by, smallest_allowed, max_tries, self._verbose, build_options, total_days)
+        component_initial_days = [
+            {x: self._initial_days[x] for x in component if x in self._initial_days}
+            for component in components
         ]
 
-    def _get_student_classes(self) -> dict[str, dict[str, dict[int, str]]]:
-        student_classes: dict[str, dict[str, dict[int, str]]] = {}
-        for student in (
-            self._schedule_df[["student", "block", "class"]]
-            .sort_values(
-                by=[
-                    "block",
-                    "class",
+        if self._workers > 1 and len(component_dfs) > 1:
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                futures = [
+                    executor.submit(_build_component_worker, x, *args, y)
+                    for x, y in zip(component_dfs, component_initial_days)
                 ]
-            )
-            .to_numpy()
-        ):
-            if student[0] in student_classes:
-                student_classes[student[0]]["blocks"][student[1]] = student[2]
-            else:
-                student_classes[student[0]] = {"blocks": {student[1]: student[2]}}
-
-        return student_classes
+                component_schedule_dfs = [f.result() for f in futures]
+        else:
+            component_schedule_dfs = [
+                _build_component_worker(x, *args, y)
+                for x, y in zip(component_dfs, component_initial_days)
+            ]
 
-    def _get_total_classes(self, reduced_classes: list[ReducedClass]) -> int:
-        total_classes = 1
-        for c in reduced_classes:
-            if c["num_classes"] > total_classes:
-                total_classes = c["num_classes"]
+        self.final_schedule_df = pd.concat(component_schedule_dfs, ignore_index=True).sort_values(
+            by=["day_number", "block", "class"]
+        )
 
-        return total_classes
+        if self._verbose:
+            self._logger.info("Building independent groups of students complete")
 
-    def _init_classes(self, reduce_by: float, smallest_allowed: int) -> list[ScheduleDays]:
-        class_sizes = self._get_class_size()
-        reduced_classes = self._reduce_class(
-            class_size=class_sizes, reduce_by=reduce_by, smallest_allowed=smallest_allowed
-        )
-        total_classes = self._get_total_classes(reduced_classes)
-        classes: list[ScheduleDays] = []
+    def _build_cached_schedule(
+        self, reduce_by: float, smallest_allowed: int = 1, max_tries: int = 10
+    ) -> None:
+        self._set_build_params(reduce_by, smallest_allowed)
+        self.final_schedule_df = self._get_cached_schedule(reduce_by, smallest_allowed)
+        if self.final_schedule_df is None:
+            self._build_schedule(reduce_by, smallest_allowed, max_tries)
+            self._set_cached_schedule(reduce_by, smallest_allowed)
+
+        if self.final_schedule_df is not None:
+            self.final_schedule_df = restore_id_types(self.final_schedule_df, self._integer_ids)
+
+    def _build_options(self) -> dict[str, Any]:
+        return {
+            "ordering": self._ordering,
+            "day_policy": self._day_policy,
+            "decompose": self._decompose,
+            "backtrack_depth": self._backtrack_depth,
+            "portfolio": self._strategies,
+        }
+
+    def _cache_key(self, reduce_by: float, smallest_allowed: int) -> str:
+        params: dict[str, Any] = {
+            "reduce_by": reduce_by,
+            "smallest_allowed": smallest_allowed,
+            **self._build_options(),
+        }
+        if self._initial_days:
+            params["initial_days"] = self._initial_days
+
+        return make_cache_key(self._schedule_df, **params)
+
+    def _expand_fill_classes(
+        self, fill_classes: list[Section], student_names: list[str]
+    ) -> pd.DataFrame:
+        return pd.DataFrame(self._fill_columns(fill_classes, student_names))
+
+    def _get_limiter(self) -> asyncio.Semaphore:
+        if self._limiter is None:
+            self._limiter = asyncio.Semaphore(1)
+
+        return self._limiter
+
+    def _get_cached_schedule(
+        self, reduce_by: float, smallest_allowed: int
+    ) -> Optional[pd.DataFrame]:
+        if self._cache is None:
+            return None
 
-        for c in class_sizes:
-            class_append: ScheduleDays = c  # type: ignore
-            class_list: list[set] = []
-            for _ in range(total_classes):
-                class_list.append(set())
+        cached_schedule_df = self._cache.get(self._cache_key(reduce_by, smallest_allowed))
 
-            class_append["classes"] = class_list
-            classes.append(class_append)
+        if self._verbose and cached_schedule_df is not None:
+            self._logger.info("Schedule found in cache")
 
-        return classes
+        return cached_schedule_df
 
     def _load_data(self, file_path: str) -> pd.DataFrame:
         df = pd.read_excel(file_path, engine="openpyxl")
         df = df.dropna()
         return df
 
-    def _reduce_class(
-        self, class_size: list[ScheduleTotalStudents], reduce_by: float, smallest_allowed: int
-    ) -> list[ReducedClass]:
-        reduced_class: list[ReducedClass] = class_size  # type: ignore
-        for c in reduced_class:
-            reduced = floor(c["total_students"] * reduce_by)
-            size = max(reduced, smallest_allowed)
-            num_classes = ceil(c["total_students"] / size)
-            c["max_students"] = size
-            c["num_classes"] = num_classes
+    def _normalize_schedule_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self._verbose:
+            self._logger.info("Checking schedule input")
+
+        with self._memory_phase("normalize_input", in_attempt=False):
+            self._integer_ids = integer_id_columns(df)
+            try:
+                normalized_df, self.input_report = normalize_schedule(df)
+            except InvalidInputError as e:
+                self.input_report = e.report
+                if self._verbose and e.report is not None:
+                    for conflict in e.report["conflicts"]:
+                        self._logger.error(
+                            f"{conflict['student']} is in more than one class in block "
+                            f"{conflict['block']}: {', '.join(conflict['classes'])}"
+                        )
+                raise
 
-        return reduced_class
+        if self._verbose:
+            if self.input_report["null_rows"]:
+                self._logger.warning(
+                    f"Dropped {len(self.input_report['null_rows'])} rows with missing values"
+                )
+
+            if self.input_report["duplicate_rows"]:
+                self._logger.warning(
+                    f"Dropped {len(self.input_report['duplicate_rows'])} duplicate rows"
+                )
+
+            self._logger.info("Checking schedule input complete")
+
+        return normalized_df
+
+    @contextmanager
+    def _profile_memory(self) -> Iterator[None]:
+        if self._memory_profiler is None:
+            yield
+            return
+
+        self._memory_profiler.start()
+        try:
+            yield
+        finally:
+            self._memory_profiler.stop()
+            self.memory_stats_df = pd.DataFrame(
+                self._memory_profiler.stats, columns=["attempt", "phase", "peak_bytes", "net_bytes"]
+            )
+
+            if self._verbose:
+                self._logger.info(
+                    f"Peak memory {self.memory_stats_df['peak_bytes'].max() / 1024 / 1024:.1f} MiB"
+                )
+
+    def _read_schedule_file(self, schedule_file_path: Union[Path, str]) -> pd.DataFrame:
+        file_path = (
+            Path(schedule_file_path) if isinstance(schedule_file_path, str) else schedule_file_path
+        )
+
+        if file_path.suffix not in (".xlsx", ".csv"):
+            raise ValueError("File should either be an xlsx Excel or a csv file")
+
+        if self._input_cache is not None:
+            cached_df = self._input_cache.get(file_path)
+            if cached_df is not None:
+                if self._verbose:
+                    self._logger.info("Using cached copy of the schedule file")
+
+                return cached_df
+
+        with self._memory_phase("read_file", in_attempt=False):
+            if file_path.suffix == ".xlsx":
+                df = pd.read_excel(file_path)
+            else:
+                df = pd.read_csv(file_path)
+
+        if self._input_cache is not None:
+            # The cache only saves time so a copy that can't be saved doesn't stop the build
+            try:
+                self._input_cache.set(file_path, df)
+            except OSError as e:
+                self._logger.warning(f"Unable to cache a copy of {file_path}: {e}")
+
+        return df
+
+    def _set_initial_schedule(self, initial_schedule: Optional[pd.DataFrame]) -> None:
+        if initial_schedule is None:
+            self._initial_days = {}
+            return
+
+        if not {"student", "day_number"} <= set(initial_schedule.columns):
+            raise ValueError("The initial schedule should contain student and day_number columns")
+
+        self._initial_days = normalize_initial_days(initial_schedule)
+
+    def _set_schedule_df(self, df: pd.DataFrame) -> None:
+        self._schedule_df = df
+        self._set_columns(df["block"].tolist(), df["class"].tolist(), df["student"].tolist())
+
+    def _set_build_params(self, reduce_by: float, smallest_allowed: int) -> None:
+        self._build_params = {
+            "reduce_by": reduce_by,
+            "smallest_allowed": smallest_allowed,
+            **self._build_options(),
+        }
+
+    def _set_cached_schedule(self, reduce_by: float, smallest_allowed: int) -> None:
+        if self._cache is None or self.final_schedule_df is None:
+            return
+
+        self._cache.set(self._cache_key(reduce_by, smallest_allowed), self.final_schedule_df)
 
     def _validate_class_size(self, reduced_df: pd.DataFrame) -> Optional[pd.DataFrame]:
         df = (
@@ -463,10 +696,11 @@ class ScheduleBuilder:
         if self._verbose:
             self._logger.info("Validating generated schedule")
 
-        validated_class_size = self._validate_class_size(fill_class_df)
-        validated_classes_numbers = self._validate_classes(fill_class_df)
-        validated_same_days = self._validate_same_day(fill_class_df)
-        validated_students = self._validate_students(fill_class_df)
+        with self._memory_phase("validate"):
+            validated_class_size = self._validate_class_size(fill_class_df)
+            validated_classes_numbers = self._validate_classes(fill_class_df)
+            validated_same_days = self._validate_same_day(fill_class_df)
+            validated_students = self._validate_students(fill_class_df)
 
         if self._verbose:
             if validated_class_size is not None:
@@ -490,7 +724,7 @@ class ScheduleBuilder:
             or validated_students
         ):
             if self._attempt >= max_tries:
-                raise SchedulingError("No possible schedule found")
+                self._raise_no_schedule()
 
             self._attempt += 1
             self._build_schedule(reduce_by, smallest_allowed, max_tries)
@@ -503,6 +737,58 @@ class ScheduleBuilder:
         if self._verbose:
             self._logger.info("Saving schedule complete")
 
+    async def _run_async(self, func: Callable[..., Any], *args: Any) -> Any:
+        async with self._get_limiter():
+            return await self._run_in_executor(func, *args)
+
+    async def _run_in_executor(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        cancel_event = threading.Event()
+        if isinstance(self._executor, ProcessPoolExecutor):
+            call = partial(func, *args)
+        else:
+            call = partial(self._run_cancellable, cancel_event, func, *args)
+
+        executor_future: Optional[Future[Any]] = None
+        if self._executor is None:
+            future = loop.run_in_executor(None, call)
+        else:
+            executor_future = self._executor.submit(call)
+            future = asyncio.wrap_future(executor_future, loop=loop)
+
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel_event.set()
+
+            # A build still waiting in the executor's queue is dropped without being run
+            if executor_future is not None and executor_future.cancel():
+                raise
+
+            # The limiter is held until the build has actually stopped so a cancelled build
+            # never runs alongside the next one
+            await _wait_done(future)
+            raise
+
+    async def _run_in_thread(self, func: Callable[..., Any], *args: Any) -> Any:
+        # Used for short steps that change the builder, which are finished even when the task is
+        # cancelled so the builder is never left half updated
+        future = asyncio.get_running_loop().run_in_executor(None, partial(func, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await _wait_done(future)
+            raise
+
+    def _run_cancellable(
+        self, cancel_event: threading.Event, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        self._cancel_events.current = cancel_event
+        try:
+            return func(*args)
+        finally:
+            self._cancel_events.current = None
+
     def _validate_same_day(self, reduced_df: pd.DataFrame) -> Optional[pd.DataFrame]:
         reduced_df = reduced_df[["student", "day_number"]].drop_duplicates()
         reduced_df = reduced_df.groupby("student").size().to_frame("count").reset_index()
@@ -514,13 +800,98 @@ class ScheduleBuilder:
         return reduced_df
 
     def _validate_students(self, reduced_df: pd.DataFrame) -> Optional[list[str]]:
+        scheduled_students = set(reduced_df["student"].unique().tolist())
         missing = [
             student
             for student in self._schedule_df["student"].unique().tolist()
-            if student not in reduced_df["student"].unique().tolist()
+            if student not in scheduled_students
         ]
 
         if not missing:
             return None
 
         return missing
+
+
+async def _wait_done(future: asyncio.Future[Any]) -> None:
+    while not future.done():
+        try:
+            await asyncio.wait({future})
+        except asyncio.CancelledError:
+            pass
+
+    if not future.cancelled():
+        future.exception()
+
+
+def _build_component_worker(
+    df: pd.DataFrame,
+    reduce_by: float,
+    smallest_allowed: int,
+    max_tries: int,
+    verbose: bool,
+    build_options: dict[str, Any],
+    total_days: int,
+    initial_days: dict[str, int],
+) -> Optional[pd.DataFrame]:
+    # Every group uses the same number of days as the full schedule so the days line up
+    schedule_builder = ScheduleBuilder(**build_options)
+    schedule_builder._set_schedule_df(df)
+    schedule_builder._initial_days = initial_days
+    schedule_builder._set_verbose(verbose)
+    schedule_builder._min_days = total_days
+    schedule_builder._build_schedule(reduce_by, smallest_allowed, max_tries)
+
+    return schedule_builder.final_schedule_df
+
+
+def _build_schedule_from_df_worker(
+    df: pd.DataFrame,
+    reduce_by: float,
+    smallest_allowed: int,
+    max_tries: int,
+    verbose: bool,
+    build_options: dict[str, Any],
+    initial_days: dict[str, int],
+) -> Optional[pd.DataFrame]:
+    schedule_builder = ScheduleBuilder(**build_options)
+    schedule_builder._set_schedule_df(df)
+    schedule_builder._initial_days = initial_days
+    schedule_builder._set_verbose(verbose)
+    schedule_builder._build_schedule(reduce_by, smallest_allowed, max_tries)
+
+    return schedule_builder.final_schedule_df
+
+
+def _prepare_schedule_worker(
+    schedule: Union[pd.DataFrame, Path, str],
+    reduce_by: float,
+    smallest_allowed: int,
+    verbose: bool,
+    build_options: dict[str, Any],
+    input_cache: Optional[InputCache],
+    initial_schedule: Optional[pd.DataFrame],
+    with_cache_key: bool,
+) -> tuple[pd.DataFrame, Optional[InputReport], list[str], dict[str, int], Optional[str]]:
+    schedule_builder = ScheduleBuilder(input_cache=input_cache, **build_options)
+    schedule_builder._set_verbose(verbose)
+    if not isinstance(schedule, pd.DataFrame):
+        schedule = schedule_builder._read_schedule_file(schedule)
+
+    schedule_builder._schedule_df = schedule_builder._normalize_schedule_df(schedule)
+    schedule_builder._set_initial_schedule(initial_schedule)
+    cache_key = schedule_builder._cache_key(reduce_by, smallest_allowed) if with_cache_key else None
+
+    return (
+        schedule_builder._schedule_df,
+        schedule_builder.input_report,
+        schedule_builder._integer_ids,
+        schedule_builder._initial_days,
+        cache_key,
+    )
+
+
+def _save_schedule_worker(final_schedule_df: pd.DataFrame, save_path: Union[Path, str]) -> None:
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.final_schedule_df = final_schedule_df
+    schedule_builder.save_schedule(save_path)
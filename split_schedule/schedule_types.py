@@ -1,4 +1,7 @@
-from typing import List, Set, TypedDict
+from typing import TYPE_CHECKING, Hashable, List, Optional, TypedDict
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class BaseSchedule(TypedDict):
@@ -6,14 +9,88 @@ class BaseSchedule(TypedDict):
     class_name: str
 
 
+class BlockedSection(BaseSchedule):
+    times_blocked: int
+
+
 class ScheduleTotalStudents(BaseSchedule):
     total_students: int
 
 
+class ImbalanceStats(TypedDict):
+    day_student_spread: int
+    day_student_cv: float
+    max_section_spread: int
+    mean_fill_ratio: float
+    max_fill_ratio: float
+    overfull_sections: int
+
+
+class InputConflict(TypedDict):
+    student: str
+    block: int
+    classes: List[str]
+
+
+class InputReport(TypedDict):
+    total_rows: int
+    null_rows: List[Hashable]
+    duplicate_rows: List[Hashable]
+    conflicts: List[InputConflict]
+
+
+class MemoryStats(TypedDict):
+    attempt: Optional[int]
+    phase: str
+    peak_bytes: int
+    net_bytes: int
+
+
 class ReducedClass(ScheduleTotalStudents):
     max_students: int
     num_classes: int
 
 
-class ScheduleDays(ReducedClass):
-    classes: List[Set]
+class Strategy(TypedDict):
+    ordering: str
+    day_policy: str
+    backtrack_depth: int
+
+
+class StrategyStats(Strategy):
+    tries: int
+    successes: int
+    mean_reward: float
+
+
+class ScheduleReport(TypedDict):
+    sections: "pd.DataFrame"
+    days: "pd.DataFrame"
+    blocks: "pd.DataFrame"
+    students: "pd.DataFrame"
+    imbalance: ImbalanceStats
+
+
+class SweepResult(TypedDict):
+    reduce_by: float
+    smallest_allowed: int
+    feasible: bool
+    days: int
+    attempts: int
+    seconds: float
+
+
+class SharedArray(TypedDict):
+    name: str
+    dtype: str
+    shape: List[int]
+    offset: int
+
+
+class SharedProblemHandle(TypedDict):
+    shared_memory_name: str
+    arrays: List[SharedArray]
+
+
+class ScheduleViolation(BaseSchedule):
+    reason: str
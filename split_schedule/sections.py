@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+
+class Section:
+    __slots__ = (
+        "block",
+        "class_name",
+        "total_students",
+        "max_students",
+        "num_classes",
+        "rosters",
+        "counts",
+    )
+
+    def __init__(
+        self,
+        block: int,
+        class_name: str,
+        total_students: int,
+        max_students: int,
+        num_classes: int,
+        total_days: int,
+    ) -> None:
+        self.block = block
+        self.class_name = class_name
+        self.total_students = total_students
+        self.max_students = max_students
+        self.num_classes = num_classes
+
+        # Each day's roster is a set of student codes. Its size depends only on how many students
+        # are in the class that day, not on how many students are in the schedule.
+        self.rosters: list[set[int]] = [set() for _ in range(total_days)]
+        self.counts = [0] * total_days
+
+    def __repr__(self) -> str:
+        return (
+            f"Section(block={self.block!r}, class_name={self.class_name!r}, "
+            f"max_students={self.max_students!r}, counts={self.counts!r})"
+        )
+
+    def add(self, day: int, student_code: int) -> None:
+        self.rosters[day].add(student_code)
+        self.counts[day] += 1
+
+    def remove(self, day: int, student_code: int) -> None:
+        self.rosters[day].discard(student_code)
+        self.counts[day] -= 1
+
+    def has_room(self, day: int) -> bool:
+        return self.counts[day] < self.max_students
+
+    def has_full_day(self) -> bool:
+        return any(x >= self.max_students for x in self.counts)
+
+    def student_codes(self, day: int) -> Iterator[int]:
+        return iter(sorted(self.rosters[day]))
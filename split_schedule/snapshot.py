@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+
+from split_schedule.core import SCHEDULE_COLUMNS
+from split_schedule.index import INDEX_ARRAYS, ScheduleIndex, encode_sections
+
+SNAPSHOT_MAGIC = b"SPLITSCH"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_ARRAYS = INDEX_ARRAYS + ("section_totals", "section_max_students", "section_num_classes")
+
+# The file starts with the magic bytes, the format version, and the length of the JSON header
+_PREFIX = struct.Struct("<8sQQ")
+
+
+class ScheduleSnapshot:
+    __slots__ = ("index", "params", "section_totals", "section_max_students", "section_num_classes")
+
+    def __init__(self, arrays: dict[str, np.ndarray], params: dict[str, Any]) -> None:
+        self.index = ScheduleIndex(arrays)
+        self.params = params
+        self.section_totals = arrays["section_totals"]
+        self.section_max_students = arrays["section_max_students"]
+        self.section_num_classes = arrays["section_num_classes"]
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {
+            **self.index.arrays(),
+            "section_totals": self.section_totals,
+            "section_max_students": self.section_max_students,
+            "section_num_classes": self.section_num_classes,
+        }
+
+    def columns(self) -> dict[str, list]:
+        index = self.index
+        student_codes = np.repeat(np.arange(len(index)), np.diff(index.student_offsets))
+        sections = index.student_sections
+
+        return {
+            "block": index.section_blocks[sections].tolist(),
+            "class": index.section_classes[sections].tolist(),
+            "total_students": self.section_totals[sections].tolist(),
+            "max_students": self.section_max_students[sections].tolist(),
+            "num_classes": self.section_num_classes[sections].tolist(),
+            "day_number": index.student_days[student_codes].astype(np.int64).tolist(),
+            "student": index.student_names[student_codes].tolist(),
+        }
+
+
+def load_snapshot(snapshot_path: Union[Path, str]) -> ScheduleSnapshot:
+    data = np.memmap(snapshot_path, dtype=np.uint8, mode="r")
+    if len(data) < _PREFIX.size:
+        raise ValueError(f"{snapshot_path} is not a schedule snapshot")
+
+    magic, version, header_size = _PREFIX.unpack(bytes(data[: _PREFIX.size]))
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{snapshot_path} is not a schedule snapshot")
+
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported schedule snapshot version {version}")
+
+    header_start, header_end = _PREFIX.size, _PREFIX.size + header_size
+    header = json.loads(bytes(data[header_start:header_end]))
+    data_start = _aligned(_PREFIX.size + header_size)
+
+    # The arrays are views of the mapped file so only the pages that are used are read
+    arrays = {
+        x["name"]: np.ndarray(
+            tuple(x["shape"]),
+            dtype=np.dtype(x["dtype"]),
+            buffer=data,
+            offset=data_start + x["offset"],
+        )
+        for x in header["arrays"]
+    }
+
+    return ScheduleSnapshot(arrays, header["params"])
+
+
+def save_snapshot(
+    columns: dict[str, Sequence],
+    save_path: Union[Path, str],
+    params: Optional[dict[str, Any]] = None,
+) -> None:
+    if not set(SCHEDULE_COLUMNS) <= set(columns):
+        raise ValueError(f"The schedule should contain {', '.join(SCHEDULE_COLUMNS)} columns")
+
+    blocks = np.asarray(columns["block"]).astype(np.int64)
+    classes = np.asarray(columns["class"]).astype(str)
+    index = ScheduleIndex.from_columns(
+        columns["block"], columns["class"], columns["day_number"], columns["student"]
+    )
+    _, section_rows = encode_sections(blocks, classes)
+    arrays = {
+        **index.arrays(),
+        "section_totals": np.asarray(columns["total_students"]).astype(np.int64)[section_rows],
+        "section_max_students": np.asarray(columns["max_students"]).astype(np.int64)[section_rows],
+        "section_num_classes": np.asarray(columns["num_classes"]).astype(np.int64)[section_rows],
+    }
+
+    layout = []
+    size = 0
+    for name in SNAPSHOT_ARRAYS:
+        # Each array starts on an 8 byte boundary so the mapped views are aligned
+        size = _aligned(size)
+        layout.append(
+            {
+                "name": name,
+                "dtype": arrays[name].dtype.str,
+                "shape": list(arrays[name].shape),
+                "offset": size,
+            }
+        )
+        size += arrays[name].nbytes
+
+    header = json.dumps({"params": params or {}, "arrays": layout}).encode()
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    # The snapshot is written next to its final path and then renamed so a process loading it
+    # never sees a partly written file
+    save_path = Path(save_path)
+    temp_path = save_path.with_name(f"{save_path.name}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(_PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+        f.write(header)
+        for x in layout:
+            f.write(b"\0" * (data_start + x["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(arrays[x["name"]]).tobytes())
+    os.replace(temp_path, save_path)
+
+
+def _aligned(size: int) -> int:
+    return size + -size % 8
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from math import ceil, floor
+from time import perf_counter
+from typing import List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from split_schedule.core import ScheduleEngine
+from split_schedule.errors import SchedulingError
+from split_schedule.normalize import integer_id_columns, normalize_schedule, restore_id_types
+from split_schedule.problem import EncodedProblem, SharedProblem, attach_problem
+from split_schedule.schedule_types import SharedProblemHandle, SweepResult
+from split_schedule.sections import Section
+
+_Filled = Tuple[ScheduleEngine, List[Section]]
+
+_worker_problem: Optional[EncodedProblem] = None
+
+
+def sweep(
+    df: pd.DataFrame,
+    reduce_by: Union[float, Sequence[float]] = 0.2,
+    smallest_allowed: Union[int, Sequence[int]] = 1,
+    max_tries: int = 10,
+    workers: int = 1,
+) -> pd.DataFrame:
+    reduce_by_values = [reduce_by] if isinstance(reduce_by, (float, int)) else reduce_by
+    smallest_allowed_values = (
+        [smallest_allowed] if isinstance(smallest_allowed, int) else smallest_allowed
+    )
+    settings = list(product(reduce_by_values, smallest_allowed_values))
+
+    df, _ = normalize_schedule(df)
+
+    # Every setting is run by the engine on one encoded copy of the problem, whether it is run here
+    # or in a worker
+    problem = EncodedProblem.from_columns(df["block"], df["class"], df["student"])
+    if workers > 1:
+        # The workers attach to one shared copy of the encoded problem instead of each being sent
+        # a pickled copy
+        with SharedProblem(problem) as shared_problem, ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(shared_problem.handle,)
+        ) as executor:
+            futures = [executor.submit(_run_worker_setting, r, s, max_tries) for r, s in settings]
+            results = [f.result() for f in futures]
+    else:
+        results = [_run_setting(problem, r, s, max_tries) for r, s in settings]
+
+    return pd.DataFrame(
+        results,
+        columns=["reduce_by", "smallest_allowed", "feasible", "days", "attempts", "seconds"],
+    )
+
+
+def find_min_reduce_by(
+    df: pd.DataFrame,
+    smallest_allowed: int = 1,
+    low: float = 0.05,
+    high: float = 1.0,
+    precision: float = 0.01,
+    max_tries: int = 10,
+) -> tuple[float, pd.DataFrame]:
+    if not 0 < low <= high:
+        raise ValueError("low must be greater than 0 and less than or equal to high")
+
+    if precision <= 0:
+        raise ValueError("precision must be greater than 0")
+
+    integer_ids = integer_id_columns(df)
+    df, _ = normalize_schedule(df)
+    problem = EncodedProblem.from_columns(df["block"], df["class"], df["student"])
+    class_sizes = problem.class_sizes()
+
+    # reduce_by values that give the same class sizes are the same problem so each is only tried
+    # once
+    tried: dict[tuple[int, ...], Optional[_Filled]] = {}
+
+    def probe(step: int) -> Optional[_Filled]:
+        reduce_by = round(step * precision, 10)
+        reduced_classes = ScheduleEngine()._reduce_class(
+            [c.copy() for c in class_sizes], reduce_by, smallest_allowed
+        )
+        reduced_sizes = tuple(c["max_students"] for c in reduced_classes)
+        if reduced_sizes not in tried:
+            schedule_engine = ScheduleEngine()
+            schedule_engine._set_problem(problem)
+            try:
+                tried[reduced_sizes] = (
+                    schedule_engine,
+                    schedule_engine._build_fill_classes(reduce_by, smallest_allowed, max_tries),
+                )
+            except SchedulingError:
+                tried[reduced_sizes] = None
+
+        return tried[reduced_sizes]
+
+    low_step = ceil(round(low / precision, 10))
+    high_step = floor(round(high / precision, 10))
+    best = probe(high_step)
+    if best is None:
+        raise SchedulingError("No possible schedule found")
+
+    while low_step < high_step:
+        mid_step = (low_step + high_step) // 2
+        filled = probe(mid_step)
+        if filled is None:
+            low_step = mid_step + 1
+        else:
+            high_step = mid_step
+            best = filled
+
+    # Only the returned setting is turned into a DataFrame
+    schedule_engine, fill_classes = best
+    best_schedule_df = pd.DataFrame(
+        schedule_engine._fill_columns(
+            fill_classes, list(schedule_engine._get_cached_student_classes())
+        )
+    ).sort_values(by=["day_number", "block", "class"])
+
+    return round(high_step * precision, 10), restore_id_types(best_schedule_df, integer_ids)
+
+
+def _init_worker(handle: SharedProblemHandle) -> None:
+    global _worker_problem
+    _worker_problem = attach_problem(handle)
+
+
+def _run_setting(
+    problem: EncodedProblem, reduce_by: float, smallest_allowed: int, max_tries: int
+) -> SweepResult:
+    schedule_engine = ScheduleEngine()
+    schedule_engine._set_problem(problem)
+    start = perf_counter()
+    try:
+        schedule_engine._build_fill_classes(reduce_by, smallest_allowed, max_tries)
+        feasible = True
+    except SchedulingError:
+        feasible = False
+
+    return _sweep_result(
+        schedule_engine, reduce_by, smallest_allowed, feasible, perf_counter() - start
+    )
+
+
+def _run_worker_setting(reduce_by: float, smallest_allowed: int, max_tries: int) -> SweepResult:
+    if _worker_problem is None:
+        raise RuntimeError("Sweep worker was not initialized")
+
+    return _run_setting(_worker_problem, reduce_by, smallest_allowed, max_tries)
+
+
+def _sweep_result(
+    schedule_engine: ScheduleEngine,
+    reduce_by: float,
+    smallest_allowed: int,
+    feasible: bool,
+    seconds: float,
+) -> SweepResult:
+    reduced_classes = schedule_engine._reduce_class(
+        schedule_engine._get_cached_class_size(), reduce_by, smallest_allowed
+    )
+
+    return {
+        "reduce_by": reduce_by,
+        "smallest_allowed": smallest_allowed,
+        "feasible": feasible,
+        "days": schedule_engine._get_total_classes(reduced_classes),
+        "attempts": schedule_engine._attempt,
+        "seconds": seconds,
+    }
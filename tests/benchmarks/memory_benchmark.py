@@ -0,0 +1,56 @@
+import argparse
+import multiprocessing
+import resource
+import sys
+
+from split_schedule import ScheduleBuilder
+from split_schedule.errors import SchedulingError
+from tests.helpers import make_roster
+
+
+def _build(num_students, reduce_by, results):
+    schedule_builder = ScheduleBuilder(profile_memory=True)
+    try:
+        schedule_builder.build_schedule_from_df(make_roster(num_students), reduce_by)
+        feasible = True
+    except SchedulingError:
+        feasible = False
+
+    # ru_maxrss is in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    peak_traced = int(schedule_builder.memory_stats_df["peak_bytes"].max())
+    results.put((num_students, feasible, peak_rss, peak_traced))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak memory of schedule builds by roster size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400, 800])
+    parser.add_argument("--reduce-by", type=float, default=0.5)
+    parser.add_argument("--max-rss-mib", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    # Each size is built in a fresh process so the peak RSS of one build doesn't carry over to the
+    # next
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    failed = False
+    print(f"{'students':>10} {'feasible':>9} {'peak rss MiB':>13} {'peak traced MiB':>16}")
+    for num_students in args.sizes:
+        process = context.Process(target=_build, args=(num_students, args.reduce_by, results))
+        process.start()
+        num_students, feasible, peak_rss, peak_traced = results.get()
+        process.join()
+
+        peak_rss_mib = peak_rss / 1024 / 1024
+        print(
+            f"{num_students:>10} {str(feasible):>9} {peak_rss_mib:>13.1f} "
+            f"{peak_traced / 1024 / 1024:>16.1f}"
+        )
+        if args.max_rss_mib is not None and peak_rss_mib > args.max_rss_mib:
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@ from itertools import combinations
 import pandas as pd
 import pytest
 
+from split_schedule.schedule_builder import ScheduleBuilder
+
 mock_data = {
     "block": [
         1,
@@ -232,6 +234,14 @@ def test_schedule_df():
     return pd.DataFrame(mock_data)
 
 
+@pytest.fixture
+def final_schedule_df(test_schedule_df):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+
+    return schedule_builder.final_schedule_df
+
+
 @pytest.fixture(scope="session")
 def test_schedule(tmp_path_factory):
     save_dir = tmp_path_factory.mktemp("schedule").joinpath("original_schedule.xlsx")
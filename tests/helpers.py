@@ -1,8 +1,12 @@
+import os
+import sys
 from math import ceil, floor
 from pathlib import Path
-from typing import List, Set
+from random import Random
 
-from split_schedule.schedule_types import ScheduleDays
+import pandas as pd
+
+from split_schedule.sections import Section
 
 ASSETS_PATH = Path().absolute().joinpath("tests/assets/")
 TEST_FILE_PATH = ASSETS_PATH.joinpath("classes.xlsx")
@@ -11,18 +15,33 @@ TEST_FILE_PATH = ASSETS_PATH.joinpath("classes.xlsx")
 def init_classes_check(class_size, reduce_by, smallest_allowed):
     reduce_classes = reduce_classes_check(reduce_by, smallest_allowed, class_size)
     total_classes = total_classes_check(reduce_classes)
-    classes: List[ScheduleDays] = []
 
-    for c in class_size:
-        class_append: ScheduleDays = c  # type: ignore
-        class_list: List[Set] = []
-        for _ in range(total_classes):
-            class_list.append(set())
+    return [
+        Section(
+            c["block"],
+            c["class_name"],
+            c["total_students"],
+            c["max_students"],
+            c["num_classes"],
+            total_classes,
+        )
+        for c in reduce_classes
+    ]
 
-        class_append["classes"] = class_list
-        classes.append(class_append)
 
-    return classes
+def section_values(sections):
+    return [
+        (
+            c.block,
+            c.class_name,
+            c.total_students,
+            c.max_students,
+            c.num_classes,
+            c.rosters,
+            c.counts,
+        )
+        for c in sections
+    ]
 
 
 def reduce_classes_check(reduce_by, smallest_allowed, class_size):
@@ -45,3 +64,82 @@ def total_classes_check(reduced_classes):
             check_total_classes = c["num_classes"]
 
     return check_total_classes
+
+
+def make_roster(num_students, num_blocks=4, students_per_class=25, seed=0):
+    random = Random(seed)
+    classes_per_block = max(num_students // students_per_class, 1)
+    rows = [
+        (block, f"class {block}-{random.randrange(classes_per_block)}", f"student {student}")
+        for student in range(num_students)
+        for block in range(1, num_blocks + 1)
+    ]
+
+    return pd.DataFrame(rows, columns=["block", "class", "student"])
+
+
+def count_operations(func, *args):
+    # Counts the bytecode instructions run in split_schedule code. Library code is not traced so
+    # the counts do not change with the installed pandas version.
+    operations = 0
+
+    def trace(frame, event, arg):
+        nonlocal operations
+        if event == "call" and "split_schedule" not in frame.f_code.co_filename:
+            return None
+
+        frame.f_trace_opcodes = True
+        if event == "opcode":
+            operations += 1
+
+        return trace
+
+    previous_trace = sys.gettrace()
+    sys.settrace(trace)
+    try:
+        func(*args)
+    finally:
+        sys.settrace(previous_trace)
+
+    return operations
+
+
+def count_library_calls(func, *args):
+    # Counts the calls split_schedule code makes straight into pandas and NumPy. One of these calls
+    # can do any amount of work that count_operations doesn't see, so a step that makes them once
+    # per student is quadratic even when its own bytecode grows linearly.
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event == "call":
+            caller = frame.f_back
+            if caller is not None and _is_split_schedule(caller) and _is_library_file(frame):
+                calls += 1
+        elif event == "c_call" and _is_split_schedule(frame) and _is_library_function(arg):
+            calls += 1
+
+    previous_profile = sys.getprofile()
+    sys.setprofile(profile)
+    try:
+        func(*args)
+    finally:
+        sys.setprofile(previous_profile)
+
+    return calls
+
+
+def _is_split_schedule(frame):
+    return f"{os.sep}split_schedule{os.sep}" in frame.f_code.co_filename
+
+
+def _is_library_file(frame):
+    return any(f"{os.sep}{x}{os.sep}" in frame.f_code.co_filename for x in ("pandas", "numpy"))
+
+
+def _is_library_function(function):
+    module = (
+        getattr(function, "__module__", None)
+        or type(getattr(function, "__self__", None)).__module__
+    )
+    return module.split(".")[0] in ("pandas", "numpy")
@@ -1,13 +1,23 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pandas as pd
 import pytest
 
+from split_schedule.cache import MemoryCache
 from split_schedule.schedule_builder import ScheduleBuilder
 
 
 @pytest.mark.parametrize("reduce_by", [0.1, 0.2, 0.5])
 @pytest.mark.parametrize("smallest_allowed", [1, 5, 10])
-def test_build_schedule_from_df(reduce_by, smallest_allowed, test_schedule_df):
-    schedule_builder = ScheduleBuilder()
+@pytest.mark.parametrize("ordering", ["matches", "most_classes", "tightest", "dsatur"])
+@pytest.mark.parametrize("day_policy", ["random", "most_room"])
+def test_build_schedule_from_df(
+    reduce_by, smallest_allowed, ordering, day_policy, test_schedule_df
+):
+    schedule_builder = ScheduleBuilder(ordering=ordering, day_policy=day_policy)
     schedule_builder.build_schedule_from_df(
         test_schedule_df, reduce_by, smallest_allowed, verbose=True
     )
@@ -91,3 +101,161 @@ def test_build_schedule_from_file_excel(tmp_path, reduce_by, smallest_allowed, t
 
     assert student_classes == expected_student_classes
     assert columns == expected_columns
+
+
+@pytest.mark.parametrize("executor", [None, ThreadPoolExecutor(max_workers=2)])
+def test_abuild_schedule_from_df(executor, test_schedule_df):
+    schedule_builder = ScheduleBuilder(executor=executor)
+    asyncio.run(schedule_builder.abuild_schedule_from_df(test_schedule_df))
+
+    expected_student_classes = test_schedule_df.groupby("student").size().to_dict()
+    student_classes = schedule_builder.final_schedule_df.groupby("student").size().to_dict()
+
+    assert student_classes == expected_student_classes
+
+
+def test_abuild_schedule_from_file_process_pool(tmp_path, test_schedule_csv):
+    export_path = tmp_path.joinpath("schedule.csv")
+
+    async def build():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            schedule_builder = ScheduleBuilder(executor=executor)
+            await schedule_builder.abuild_schedule_from_file(test_schedule_csv)
+            await schedule_builder.asave_schedule(export_path)
+
+        return schedule_builder
+
+    schedule_builder = asyncio.run(build())
+    expected_df = pd.read_csv(test_schedule_csv)
+
+    assert expected_df.equals(schedule_builder._schedule_df)
+    assert export_path.exists()
+    assert len(pd.read_csv(export_path)) == len(expected_df)
+
+
+def test_abuild_schedule_from_file_process_pool_cache(test_schedule_csv):
+    cache = MemoryCache()
+    cache_gets = []
+    cache_get = cache.get
+
+    def tracking_get(key):
+        df = cache_get(key)
+        cache_gets.append(df is not None)
+        return df
+
+    cache.get = tracking_get
+
+    async def build():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            schedule_dfs = []
+            for _ in range(2):
+                schedule_builder = ScheduleBuilder(executor=executor, cache=cache)
+                await schedule_builder.abuild_schedule_from_file(test_schedule_csv)
+                schedule_dfs.append(schedule_builder.final_schedule_df)
+
+        return schedule_dfs
+
+    first_df, second_df = asyncio.run(build())
+
+    assert cache_gets == [False, True]
+    assert first_df.equals(second_df)
+
+
+def test_abuild_schedule_cancel_queued_process_pool(test_schedule_df):
+    async def build():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            # One call runs and two more are handed to the worker ahead of time, so the build waits
+            # in the executor's queue
+            busy = [executor.submit(time.sleep, 0.5) for _ in range(3)]
+            schedule_builder = ScheduleBuilder(executor=executor)
+            task = asyncio.create_task(schedule_builder.abuild_schedule_from_df(test_schedule_df))
+            await asyncio.sleep(0.1)
+
+            start = time.perf_counter()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            seconds = time.perf_counter() - start
+
+            for future in busy:
+                future.result()
+
+        return schedule_builder, seconds
+
+    schedule_builder, seconds = asyncio.run(build())
+
+    assert seconds < 0.5
+    assert schedule_builder.final_schedule_df is None
+
+
+def test_abuild_schedule_from_df_process_pool_prepares_in_pool(monkeypatch, test_schedule_df):
+    main_pid = os.getpid()
+    normalize_schedule_df = ScheduleBuilder._normalize_schedule_df
+    cache_key = ScheduleBuilder._cache_key
+
+    def mock_normalize_schedule_df(self, df):
+        assert os.getpid() != main_pid, "The class list should be cleaned up in the pool"
+        return normalize_schedule_df(self, df)
+
+    def mock_cache_key(self, *args):
+        assert os.getpid() != main_pid, "The cache key should be made in the pool"
+        return cache_key(self, *args)
+
+    monkeypatch.setattr(ScheduleBuilder, "_normalize_schedule_df", mock_normalize_schedule_df)
+    monkeypatch.setattr(ScheduleBuilder, "_cache_key", mock_cache_key)
+
+    async def build():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            schedule_builder = ScheduleBuilder(executor=executor, cache=MemoryCache())
+            await schedule_builder.abuild_schedule_from_df(test_schedule_df)
+            await schedule_builder.abuild_schedule_from_df(test_schedule_df)
+
+        return schedule_builder
+
+    schedule_builder = asyncio.run(build())
+
+    expected_student_classes = test_schedule_df.groupby("student").size().to_dict()
+    student_classes = schedule_builder.final_schedule_df.groupby("student").size().to_dict()
+
+    assert student_classes == expected_student_classes
+    assert schedule_builder.input_report["total_rows"] == len(test_schedule_df)
+    assert len(schedule_builder._students) == len(test_schedule_df)
+
+
+def test_abuild_schedule_from_df_process_pool_integer_ids(test_schedule_df):
+    df = test_schedule_df.copy()
+    df["student"] = df["student"].factorize()[0] + 1000
+
+    async def build():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            schedule_builder = ScheduleBuilder(executor=executor)
+            await schedule_builder.abuild_schedule_from_df(df)
+
+        return schedule_builder
+
+    final_schedule_df = asyncio.run(build()).final_schedule_df
+
+    assert pd.api.types.is_integer_dtype(final_schedule_df["student"])
+    assert set(final_schedule_df["student"]) == set(df["student"])
+
+
+def test_abuild_schedule_concurrency_limit(test_schedule_df):
+    running = []
+    max_running = []
+
+    class TrackingScheduleBuilder(ScheduleBuilder):
+        def build_schedule_from_df(self, *args, **kwargs):
+            running.append(1)
+            max_running.append(len(running))
+            super().build_schedule_from_df(*args, **kwargs)
+            running.pop()
+
+    async def build():
+        # Semaphores created outside the running loop are bound to a different loop on Python 3.8/3.9
+        limiter = asyncio.Semaphore(1)
+        builders = [TrackingScheduleBuilder(limiter=limiter) for _ in range(3)]
+        await asyncio.gather(*[b.abuild_schedule_from_df(test_schedule_df) for b in builders])
+
+    asyncio.run(build())
+
+    assert max(max_running) == 1
@@ -0,0 +1,141 @@
+import random
+import sys
+from math import log2
+
+import pytest
+
+from split_schedule.decompose import find_components
+from split_schedule.schedule_builder import ScheduleBuilder
+from tests.helpers import count_library_calls, count_operations, make_roster
+
+ROSTER_SIZES = [100, 200, 400, 800]
+
+# Linear phases grow with an exponent close to 1 and n log n phases a little above it. A quadratic
+# regression doubles the exponent.
+MAX_GROWTH_EXPONENT = 1.3
+
+
+def _student_classes(schedule_builder):
+    schedule_builder._get_student_classes()
+
+
+def _class_size(schedule_builder):
+    schedule_builder._get_class_size()
+
+
+def _init_classes(schedule_builder):
+    schedule_builder._init_classes(0.5, 1)
+
+
+def _check_feasibility(schedule_builder):
+    schedule_builder._check_feasibility(0.5, 1)
+
+
+def _find_components(schedule_builder):
+    find_components(schedule_builder._get_cached_student_classes())
+
+
+def _find_matches(schedule_builder):
+    schedule_builder._find_matches()
+
+
+def _fill_classes(schedule_builder):
+    schedule_builder._fill_classes(
+        schedule_builder._init_classes(0.5, 1), schedule_builder._get_cached_student_classes()
+    )
+
+
+def _expand_fill_classes(schedule_builder):
+    student_classes = schedule_builder._get_cached_student_classes()
+    fill_classes = schedule_builder._fill_classes(
+        schedule_builder._init_classes(0.5, 1), student_classes
+    )
+    schedule_builder._expand_fill_classes(fill_classes, list(student_classes))
+
+
+def _validate_students(schedule_builder):
+    schedule_builder._validate_students(schedule_builder._schedule_df)
+
+
+def _validate_schedule(schedule_builder):
+    student_classes = schedule_builder._get_cached_student_classes()
+    fill_classes = schedule_builder._fill_classes(
+        schedule_builder._init_classes(0.5, 1), student_classes
+    )
+    fill_class_df = schedule_builder._expand_fill_classes(fill_classes, list(student_classes))
+    schedule_builder._validate_class_size(fill_class_df)
+    schedule_builder._validate_classes(fill_class_df)
+    schedule_builder._validate_same_day(fill_class_df)
+    schedule_builder._validate_students(fill_class_df)
+
+
+def growth_exponents(phase, count=count_operations, **build_options):
+    operations = []
+    for num_students in ROSTER_SIZES:
+        random.seed(0)
+        schedule_builder = ScheduleBuilder(**build_options)
+        schedule_builder._set_schedule_df(make_roster(num_students))
+        schedule_builder._get_cached_student_classes()
+        schedule_builder._get_cached_class_size()
+        operations.append(count(phase, schedule_builder))
+
+    return [log2(y / x) for x, y in zip(operations, operations[1:])]
+
+
+@pytest.mark.parametrize(
+    "phase",
+    [
+        _student_classes,
+        _class_size,
+        _init_classes,
+        _check_feasibility,
+        _find_components,
+        _find_matches,
+        _validate_students,
+    ],
+)
+def test_phase_growth(phase):
+    exponents = growth_exponents(phase)
+
+    assert max(exponents[1:]) < MAX_GROWTH_EXPONENT
+
+
+@pytest.mark.parametrize("ordering", ["matches", "most_classes", "tightest", "dsatur"])
+@pytest.mark.parametrize("day_policy", ["random", "most_room"])
+def test_fill_classes_growth(ordering, day_policy):
+    exponents = growth_exponents(_fill_classes, ordering=ordering, day_policy=day_policy)
+
+    assert max(exponents[1:]) < MAX_GROWTH_EXPONENT
+
+
+def test_expand_fill_classes_growth():
+    exponents = growth_exponents(_expand_fill_classes, ordering="dsatur", day_policy="most_room")
+
+    assert max(exponents[1:]) < MAX_GROWTH_EXPONENT
+
+
+@pytest.mark.parametrize("phase", [_validate_students, _validate_schedule])
+def test_validation_library_calls(phase):
+    # The validation steps work on whole columns, so the number of pandas and NumPy calls they make
+    # should not change with the number of students
+    exponents = growth_exponents(phase, count=count_library_calls)
+
+    assert max(exponents) == 0
+
+
+def test_roster_memory_growth():
+    # The rosters of a class should only grow with the students in the class, so the memory of
+    # all of the rosters grows in line with the number of students
+    sizes = []
+    for num_students in [1000, 2000, 4000, 8000]:
+        random.seed(0)
+        schedule_builder = ScheduleBuilder(ordering="dsatur", day_policy="most_room")
+        schedule_builder._set_schedule_df(make_roster(num_students))
+        fill_classes = schedule_builder._fill_classes(
+            schedule_builder._init_classes(0.5, 1), schedule_builder._get_cached_student_classes()
+        )
+        sizes.append(sum(sys.getsizeof(x) for c in fill_classes for x in c.rosters))
+
+    exponents = [log2(y / x) for x, y in zip(sizes, sizes[1:])]
+
+    assert max(exponents) < MAX_GROWTH_EXPONENT
@@ -0,0 +1,200 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from split_schedule.cache import DiskCache, InputCache, MemoryCache, ResultCache, make_cache_key
+from split_schedule.schedule_builder import ScheduleBuilder
+
+
+def test_make_cache_key_row_order(test_schedule_df):
+    shuffled_df = test_schedule_df.sample(frac=1, random_state=1)
+
+    assert make_cache_key(test_schedule_df, reduce_by=0.2) == make_cache_key(
+        shuffled_df, reduce_by=0.2
+    )
+
+
+def test_make_cache_key_params(test_schedule_df):
+    assert make_cache_key(test_schedule_df, reduce_by=0.2) != make_cache_key(
+        test_schedule_df, reduce_by=0.5
+    )
+
+
+def test_make_cache_key_data(test_schedule_df):
+    changed_df = test_schedule_df.copy()
+    changed_df.loc[0, "class"] = "changed class"
+
+    assert make_cache_key(test_schedule_df) != make_cache_key(changed_df)
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", pd.DataFrame({"x": [1]}))
+    cache.set("b", pd.DataFrame({"x": [2]}))
+    cache.get("a")
+    cache.set("c", pd.DataFrame({"x": [3]}))
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_memory_cache_returns_copy():
+    cache = MemoryCache()
+    cache.set("a", pd.DataFrame({"x": [1]}))
+    df = cache.get("a")
+    df.loc[0, "x"] = 5
+
+    assert cache.get("a").loc[0, "x"] == 1
+
+
+@pytest.mark.parametrize("max_entries", [0, -1])
+def test_memory_cache_bad_size(max_entries):
+    with pytest.raises(ValueError):
+        MemoryCache(max_entries=max_entries)
+
+
+def test_disk_cache_lru_eviction(tmp_path):
+    df = pd.DataFrame({"x": range(100)})
+    size_path = tmp_path.joinpath("size.pickle")
+    df.to_pickle(size_path)
+    cache = DiskCache(tmp_path, max_bytes=size_path.stat().st_size * 2)
+    cache.set("a", df)
+    cache.set("b", df)
+    os.utime(tmp_path.joinpath("a.pkl"), (0, 0))
+    os.utime(tmp_path.joinpath("b.pkl"), (1, 1))
+    cache.get("a")
+    cache.set("c", df)
+
+    assert cache.get("b") is None
+    assert cache.get("a").equals(df)
+    assert cache.get("c").equals(df)
+
+
+def test_result_cache_abstract():
+    with pytest.raises(TypeError):
+        ResultCache()
+
+
+def test_memory_cache_threads():
+    cache = MemoryCache(max_entries=4)
+    df = pd.DataFrame({"x": [1]})
+
+    def use_cache(thread):
+        for i in range(500):
+            cache.set(f"{thread}-{i}", df)
+            cache.get(f"{thread}-{i - 1}")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(use_cache, range(8)))
+
+    assert len(cache) == 4
+
+
+def test_disk_cache_threads(tmp_path):
+    cache = DiskCache(tmp_path)
+    df = pd.DataFrame({"x": range(1000)})
+
+    def use_cache(_):
+        for _ in range(20):
+            cache.set("a", df)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(use_cache, range(8)))
+
+    assert cache.get("a").equals(df)
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_disk_cache_missing(tmp_path):
+    assert DiskCache(tmp_path).get("missing") is None
+
+
+@pytest.mark.parametrize("cache_type", ["memory", "disk"])
+def test_build_schedule_from_cache(monkeypatch, tmp_path, cache_type, test_schedule_df):
+    cache = MemoryCache() if cache_type == "memory" else DiskCache(tmp_path)
+    schedule_builder = ScheduleBuilder(cache=cache)
+    schedule_builder.build_schedule_from_df(test_schedule_df)
+    expected = schedule_builder.final_schedule_df
+
+    def mock_build_schedule(*args, **kwargs):
+        raise AssertionError("Schedule should come from the cache")
+
+    monkeypatch.setattr(ScheduleBuilder, "_build_schedule", mock_build_schedule)
+    schedule_builder = ScheduleBuilder(cache=cache)
+    schedule_builder.build_schedule_from_df(test_schedule_df)
+
+    assert schedule_builder.final_schedule_df.equals(expected)
+
+
+@pytest.mark.parametrize("use_directory", [True, False])
+def test_input_cache(monkeypatch, tmp_path, use_directory, test_schedule_df):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path.joinpath("user_cache")))
+    file_path = tmp_path.joinpath("schedule.csv")
+    test_schedule_df.to_csv(file_path, index=False)
+    cache = InputCache(tmp_path.joinpath("cache") if use_directory else None)
+
+    assert cache.get(file_path) is None
+
+    cache.set(file_path, test_schedule_df)
+
+    assert cache.get(file_path).equals(test_schedule_df)
+
+
+def test_input_cache_default_directory(monkeypatch, tmp_path, test_schedule_df):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path.joinpath("user_cache")))
+    data_path = tmp_path.joinpath("data")
+    data_path.mkdir()
+    file_path = data_path.joinpath("schedule.csv")
+    test_schedule_df.to_csv(file_path, index=False)
+    cache = InputCache()
+    cache.set(file_path, test_schedule_df)
+
+    assert cache.directory == tmp_path.joinpath("user_cache", "split_schedule")
+    assert cache.directory.stat().st_mode & 0o777 == 0o700
+    assert list(data_path.iterdir()) == [file_path]
+    assert len(list(cache.directory.glob("*.pkl"))) == 1
+
+
+def test_input_cache_source_changed(tmp_path, test_schedule_df):
+    file_path = tmp_path.joinpath("schedule.csv")
+    test_schedule_df.to_csv(file_path, index=False)
+    cache = InputCache(tmp_path.joinpath("cache"))
+    cache.set(file_path, test_schedule_df)
+    test_schedule_df.head(5).to_csv(file_path, index=False)
+
+    assert cache.get(file_path) is None
+
+
+def test_build_schedule_from_file_input_cache(monkeypatch, tmp_path, test_schedule):
+    cache = InputCache(tmp_path)
+    schedule_builder = ScheduleBuilder(input_cache=cache)
+    schedule_builder.build_schedule_from_file(test_schedule)
+    expected = schedule_builder._schedule_df
+
+    def mock_read_excel(*args, **kwargs):
+        raise AssertionError("Schedule file should come from the cache")
+
+    monkeypatch.setattr(pd, "read_excel", mock_read_excel)
+    schedule_builder = ScheduleBuilder(input_cache=cache)
+    schedule_builder.build_schedule_from_file(test_schedule)
+
+    assert schedule_builder._schedule_df.equals(expected)
+
+
+def test_build_schedule_from_file_input_cache_not_writable(
+    monkeypatch, caplog, tmp_path, test_schedule
+):
+    def mock_set(*args, **kwargs):
+        raise PermissionError("Permission denied")
+
+    cache = InputCache(tmp_path)
+    monkeypatch.setattr(cache, "set", mock_set)
+    schedule_builder = ScheduleBuilder(input_cache=cache)
+    schedule_builder.build_schedule_from_file(test_schedule)
+
+    assert schedule_builder.final_schedule_df is not None
+    assert "Unable to cache a copy" in caplog.text
@@ -0,0 +1,153 @@
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from split_schedule.core import ScheduleEngine, build_schedule, read_csv, write_csv
+from split_schedule.errors import InfeasibleScheduleError
+from split_schedule.schedule_builder import ScheduleBuilder
+from split_schedule.sections import Section
+from tests.conftest import mock_data
+
+
+def test_import_core_without_pandas():
+    code = "import sys, split_schedule.core; print('pandas' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize("ordering", ["matches", "dsatur"])
+def test_build_schedule(ordering, test_schedule_df):
+    columns = build_schedule(
+        mock_data["block"], mock_data["class"], mock_data["student"], ordering=ordering
+    )
+    schedule_df = pd.DataFrame(columns)
+
+    schedule_builder = ScheduleBuilder()
+    schedule_builder._set_schedule_df(test_schedule_df)
+
+    assert list(columns) == [
+        "block",
+        "class",
+        "total_students",
+        "max_students",
+        "num_classes",
+        "day_number",
+        "student",
+    ]
+    assert schedule_builder._validate_class_size(schedule_df) is None
+    assert schedule_builder._validate_classes(schedule_df) is None
+    assert schedule_builder._validate_same_day(schedule_df) is None
+    assert schedule_builder._validate_students(schedule_df) is None
+
+
+def test_build_schedule_numpy(test_schedule_df):
+    columns = build_schedule(
+        test_schedule_df["block"].to_numpy(),
+        test_schedule_df["class"].to_numpy(),
+        test_schedule_df["student"].to_numpy(),
+    )
+
+    assert len(columns["student"]) == len(test_schedule_df)
+    assert all(type(x) is int for x in columns["block"])
+
+
+def test_build_schedule_infeasible():
+    with pytest.raises(InfeasibleScheduleError):
+        build_schedule([1, 1], ["test class 1", "test class 1"], ["test 1", "test 2"], 0, 0)
+
+
+def test_build_schedule_length_mismatch():
+    with pytest.raises(ValueError):
+        build_schedule([1, 2], ["test class 1"], ["test 1"])
+
+
+def test_build_schedule_empty():
+    with pytest.raises(ValueError):
+        build_schedule([], [], [])
+
+
+@pytest.mark.parametrize("backtrack_depth", [0, 2])
+def test_place_student_backtrack(backtrack_depth):
+    sections = [Section(1, "test class 1", 2, 1, 2, 2), Section(2, "test class 2", 2, 1, 2, 2)]
+    student_sections = [[sections[0]], [sections[1]], sections]
+
+    schedule_engine = ScheduleEngine(backtrack_depth=backtrack_depth)
+    assert schedule_engine._place_student(0, student_sections, 1, 2)
+    assert schedule_engine._place_student(1, student_sections, 0, 2)
+
+    if backtrack_depth:
+        assert schedule_engine._place_student(2, student_sections, 0, 2)
+        assert sections[0].rosters == [{2}, {0}]
+        assert sections[1].rosters == [{2}, {1}]
+    else:
+        assert not schedule_engine._place_student(2, student_sections, 0, 2)
+
+
+def test_place_student_backtrack_restores():
+    sections = [Section(1, "test class 1", 3, 1, 2, 2)]
+    student_sections = [sections, sections, sections]
+
+    schedule_engine = ScheduleEngine(backtrack_depth=2)
+    assert schedule_engine._place_student(0, student_sections, 0, 2)
+    assert schedule_engine._place_student(1, student_sections, 0, 2)
+
+    assert not schedule_engine._place_student(2, student_sections, 0, 2)
+    assert sections[0].rosters == [{0}, {1}]
+    assert list(schedule_engine._undo_log) == [(0, 0), (1, 1)]
+
+
+def test_backtrack_depth_invalid():
+    with pytest.raises(ValueError):
+        ScheduleEngine(backtrack_depth=-1)
+
+
+def test_find_matches(student_matches_check):
+    schedule_engine = ScheduleEngine()
+    schedule_engine._set_columns(mock_data["block"], mock_data["class"], mock_data["student"])
+    matches = schedule_engine._find_matches()
+
+    assert [x.keys() for x in matches] == [x.keys() for x in student_matches_check]
+    assert [[sorted(y) for y in list(x.values())[0]] for x in matches] == [
+        [sorted(y) for y in list(x.values())[0]] for x in student_matches_check
+    ]
+
+
+def test_get_class_size(class_size_check):
+    schedule_engine = ScheduleEngine()
+    schedule_engine._set_columns(mock_data["block"], mock_data["class"], mock_data["student"])
+
+    assert schedule_engine._get_class_size() == class_size_check
+
+
+def test_get_student_classes(student_classes_check):
+    schedule_engine = ScheduleEngine()
+    schedule_engine._set_columns(mock_data["block"], mock_data["class"], mock_data["student"])
+
+    assert schedule_engine._get_student_classes() == student_classes_check
+
+
+def test_read_write_csv(tmp_path):
+    save_path = tmp_path.joinpath("schedule.csv")
+    columns = build_schedule(mock_data["block"], mock_data["class"], mock_data["student"])
+    write_csv(columns, save_path)
+
+    assert pd.read_csv(save_path).columns.tolist() == list(columns)
+
+    read_columns = read_csv(save_path)
+
+    assert read_columns["block"] == columns["block"]
+    assert read_columns["class"] == columns["class"]
+    assert read_columns["student"] == columns["student"]
+
+
+def test_read_csv_missing_columns(tmp_path):
+    file_path = tmp_path.joinpath("schedule.csv")
+    file_path.write_text("block,student\n1,test 1\n")
+
+    with pytest.raises(ValueError):
+        read_csv(file_path)
@@ -0,0 +1,40 @@
+import pytest
+
+from split_schedule.day_policy import order_days
+from split_schedule.schedule_builder import ScheduleBuilder
+from split_schedule.sections import Section
+
+
+@pytest.mark.parametrize("day, expected", [(0, [0, 1, 2, 3]), (2, [2, 0, 1, 3])])
+def test_order_days_random(day, expected):
+    sections = [Section(1, "test class 1", 4, 1, 4, 4)]
+
+    assert list(order_days("random", sections, day, 4)) == expected
+
+
+def test_order_days_most_room():
+    sections = [Section(1, "test class 1", 8, 3, 3, 3), Section(2, "test class 2", 6, 2, 3, 3)]
+    sections[0].add(0, 0)
+    sections[0].add(0, 1)
+    sections[0].add(1, 2)
+    sections[1].add(2, 3)
+
+    # Day 0 has room for 1 student in class 1, day 1 has room for 2 in both classes, and day 2
+    # has room for 1 student in class 2
+    assert list(order_days("most_room", sections, 2, 3)) == [1, 2, 0]
+
+
+def test_order_days_most_room_ties_start_at_day():
+    sections = [Section(1, "test class 1", 4, 2, 2, 3)]
+
+    assert list(order_days("most_room", sections, 1, 3)) == [1, 2, 0]
+
+
+def test_order_days_unknown():
+    with pytest.raises(ValueError):
+        order_days("unknown", [], 0, 1)
+
+
+def test_schedule_builder_unknown_day_policy():
+    with pytest.raises(ValueError):
+        ScheduleBuilder(day_policy="unknown")
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from split_schedule.decompose import find_components
+from split_schedule.schedule_builder import ScheduleBuilder
+
+
+def test_find_components():
+    student_classes = {
+        "test 1": {"blocks": {1: "test class 1", 2: "test class 2"}},
+        "test 2": {"blocks": {1: "test class 3"}},
+        "test 3": {"blocks": {2: "test class 2", 3: "test class 4"}},
+        "test 4": {"blocks": {3: "test class 4"}},
+        "test 5": {"blocks": {1: "test class 3", 2: "test class 5"}},
+        "test 6": {"blocks": {1: "test class 6"}},
+    }
+
+    components = sorted(sorted(x) for x in find_components(student_classes))
+
+    assert components == [
+        ["test 1", "test 3", "test 4"],
+        ["test 2", "test 5"],
+        ["test 6"],
+    ]
+
+
+def test_find_components_all_students(student_classes_check):
+    components = find_components(student_classes_check)
+
+    assert sorted(x for component in components for x in component) == sorted(student_classes_check)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_schedule_decompose(workers, test_schedule_df):
+    other_school_df = test_schedule_df.copy()
+    other_school_df["class"] = "other " + other_school_df["class"]
+    other_school_df["student"] = "other " + other_school_df["student"]
+    other_school_df = other_school_df.head(10)
+    df = pd.concat([test_schedule_df, other_school_df], ignore_index=True)
+
+    schedule_builder = ScheduleBuilder(decompose=True, workers=workers)
+    schedule_builder.build_schedule_from_df(df, 0.2)
+
+    expected_student_classes = df.groupby("student").size().to_dict()
+    final_schedule_df = schedule_builder.final_schedule_df
+    student_classes = final_schedule_df.groupby("student").size().to_dict()
+    total_days = final_schedule_df["num_classes"].max()
+
+    assert student_classes == expected_student_classes
+    assert final_schedule_df["day_number"].max() == total_days
+    assert (final_schedule_df.groupby("student")["day_number"].nunique() == 1).all()
+    assert (
+        final_schedule_df.groupby(["block", "class", "day_number"]).size()
+        <= final_schedule_df.groupby(["block", "class", "day_number"])["max_students"].first()
+    ).all()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_schedule_decompose_initial_schedule(workers, test_schedule_df):
+    # The other school's classes sort last but its rows come first, so the row order doesn't match
+    # the order of the groups
+    other_school_df = test_schedule_df.copy()
+    other_school_df["class"] = "x " + other_school_df["class"]
+    other_school_df["student"] = "x " + other_school_df["student"]
+    df = pd.concat([other_school_df, test_schedule_df], ignore_index=True)
+
+    schedule_builder = ScheduleBuilder(decompose=True, workers=workers)
+    schedule_builder.build_schedule_from_df(df, 0.2)
+    initial_schedule = schedule_builder.final_schedule_df
+
+    schedule_builder = ScheduleBuilder(decompose=True, workers=workers)
+    schedule_builder.build_schedule_from_df(df, 0.2, initial_schedule=initial_schedule)
+
+    initial_days = initial_schedule.groupby("student")["day_number"].first()
+    days = schedule_builder.final_schedule_df.groupby("student")["day_number"].first()
+
+    assert days.equals(initial_days)
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from split_schedule.diff import diff_schedules
+from split_schedule.schedule_builder import ScheduleBuilder
+
+
+@pytest.fixture
+def old_schedule_df():
+    return pd.DataFrame(
+        {
+            "block": [1, 2, 1, 1, 1],
+            "class": [
+                "test class 1",
+                "test class 2",
+                "test class 1",
+                "test class 3",
+                "test class 1",
+            ],
+            "day_number": [1, 1, 2, 1, 2],
+            "student": ["test 1", "test 1", "test 2", "test 3", "test 5"],
+        }
+    )
+
+
+@pytest.fixture
+def new_schedule_df():
+    return pd.DataFrame(
+        {
+            "block": [1, 2, 1, 1, 1],
+            "class": [
+                "test class 1",
+                "test class 2",
+                "test class 3",
+                "test class 1",
+                "test class 1",
+            ],
+            "day_number": [2, 2, 2, 1, 2],
+            "student": ["test 1", "test 1", "test 2", "test 4", "test 5"],
+        }
+    )
+
+
+def test_diff_schedules(old_schedule_df, new_schedule_df):
+    diff_df = diff_schedules(old_schedule_df, new_schedule_df)
+
+    assert diff_df["student"].tolist() == ["test 1", "test 2", "test 3", "test 4"]
+    assert diff_df["change"].tolist() == ["changed", "changed", "removed", "added"]
+    assert diff_df["old_day_number"].tolist() == [1, 2, 1, pd.NA]
+    assert diff_df["new_day_number"].tolist() == [2, 2, pd.NA, 1]
+    assert diff_df["day_changed"].tolist() == [True, False, False, False]
+    assert diff_df["classes_changed"].tolist() == [False, True, False, False]
+
+
+def test_diff_schedules_same(final_schedule_df):
+    assert diff_schedules(final_schedule_df, final_schedule_df.sample(frac=1, random_state=0)).empty
+
+
+def test_diff_schedules_rebuild(test_schedule_df):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+    old_schedule_df = schedule_builder.final_schedule_df
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.3)
+    new_schedule_df = schedule_builder.final_schedule_df
+
+    diff_df = diff_schedules(old_schedule_df, new_schedule_df)
+    merged_df = (
+        old_schedule_df.groupby("student")["day_number"]
+        .first()
+        .to_frame("old")
+        .join(new_schedule_df.groupby("student")["day_number"].first().rename("new"))
+    )
+
+    assert (
+        diff_df["student"].tolist()
+        == merged_df[merged_df["old"] != merged_df["new"]].index.tolist()
+    )
+    assert (diff_df["change"] == "changed").all()
+    assert not diff_df["classes_changed"].any()
+
+
+def test_diff_schedules_empty(old_schedule_df):
+    diff_df = diff_schedules(old_schedule_df.iloc[:0], old_schedule_df)
+
+    assert (diff_df["change"] == "added").all()
+    assert len(diff_df) == old_schedule_df["student"].nunique()
+
+
+def test_diff_schedules_missing_columns(old_schedule_df, new_schedule_df):
+    with pytest.raises(ValueError):
+        diff_schedules(old_schedule_df.drop(columns="day_number"), new_schedule_df)
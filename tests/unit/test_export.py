@@ -0,0 +1,63 @@
+import json
+
+import pandas as pd
+import pytest
+
+from split_schedule.export import export_rosters
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_export_rosters_student(final_schedule_df, tmp_path, workers):
+    paths = export_rosters(final_schedule_df, tmp_path, workers=workers)
+
+    assert len(paths) == final_schedule_df["student"].nunique()
+    for path in paths:
+        student_df = final_schedule_df[final_schedule_df["student"] == path.stem]
+        roster_df = pd.read_csv(path)
+
+        assert list(roster_df.columns) == ["day_number", "block", "class"]
+        assert roster_df.to_dict("records") == (
+            student_df.sort_values(["day_number", "block", "class"])[
+                ["day_number", "block", "class"]
+            ].to_dict("records")
+        )
+
+
+def test_export_rosters_class_json(final_schedule_df, tmp_path):
+    paths = export_rosters(final_schedule_df, tmp_path, by="class", file_format="json")
+    sections = final_schedule_df.groupby(["block", "class"])
+
+    assert len(paths) == sections.ngroups
+    for (block, class_name), section_df in sections:
+        roster = json.loads((tmp_path / f"block {block} {class_name}.json").read_text())
+
+        assert roster == section_df.sort_values(["day_number", "student"])[
+            ["day_number", "student"]
+        ].to_dict("records")
+
+
+def test_export_rosters_xlsx(final_schedule_df, tmp_path):
+    paths = export_rosters(final_schedule_df, tmp_path, by="class", file_format="xlsx")
+
+    assert sum(len(pd.read_excel(x)) for x in paths) == len(final_schedule_df)
+
+
+def test_export_rosters_file_names(tmp_path):
+    schedule_df = pd.DataFrame(
+        {
+            "block": [1, 1],
+            "class": ["test class 1", "test class 1"],
+            "day_number": [1, 2],
+            "student": ["a/b", "a_b"],
+        }
+    )
+
+    paths = export_rosters(schedule_df, tmp_path)
+
+    assert [x.name for x in paths] == ["a_b.csv", "a_b 2.csv"]
+
+
+@pytest.mark.parametrize("by, file_format", [("bad", "csv"), ("student", "bad")])
+def test_export_rosters_invalid(final_schedule_df, tmp_path, by, file_format):
+    with pytest.raises(ValueError):
+        export_rosters(final_schedule_df, tmp_path, by, file_format)
@@ -0,0 +1,96 @@
+import threading
+
+import numpy as np
+import pytest
+
+from split_schedule.index import ScheduleIndex
+
+
+@pytest.fixture
+def schedule_index(final_schedule_df):
+    return ScheduleIndex.from_columns(
+        final_schedule_df["block"],
+        final_schedule_df["class"],
+        final_schedule_df["day_number"],
+        final_schedule_df["student"],
+    )
+
+
+def test_student_lookups(final_schedule_df, schedule_index):
+    assert len(schedule_index) == final_schedule_df["student"].nunique()
+    assert schedule_index.total_days == final_schedule_df["day_number"].max()
+
+    for student, student_df in final_schedule_df.groupby("student"):
+        assert student in schedule_index
+        assert schedule_index.day(student) == student_df["day_number"].iloc[0]
+        assert schedule_index.sections(student) == sorted(
+            zip(student_df["block"], student_df["class"])
+        )
+
+
+def test_roster(final_schedule_df, schedule_index):
+    for (block, class_name, day_number), section_df in final_schedule_df.groupby(
+        ["block", "class", "day_number"]
+    ):
+        assert schedule_index.roster(block, class_name, day_number) == sorted(section_df["student"])
+
+    block, class_name = final_schedule_df[["block", "class"]].iloc[0]
+    assert sum(
+        len(schedule_index.roster(block, class_name, x))
+        for x in range(1, schedule_index.total_days + 1)
+    ) == len(
+        final_schedule_df[
+            (final_schedule_df["block"] == block) & (final_schedule_df["class"] == class_name)
+        ]
+    )
+
+
+def test_missing_keys(schedule_index):
+    assert "missing student" not in schedule_index
+
+    with pytest.raises(KeyError):
+        schedule_index.day("missing student")
+
+    with pytest.raises(KeyError):
+        schedule_index.roster(99, "missing class", 1)
+
+    block, class_name = schedule_index.sections(schedule_index.student_names[0])[0]
+    with pytest.raises(KeyError):
+        schedule_index.roster(block, class_name, schedule_index.total_days + 1)
+
+
+def test_immutable(schedule_index):
+    with pytest.raises(AttributeError):
+        schedule_index.total_days = 1
+
+    with pytest.raises(ValueError):
+        schedule_index.student_days[0] = 1
+
+
+def test_threads(final_schedule_df, schedule_index):
+    students = final_schedule_df["student"].unique().tolist()
+    expected = {x: schedule_index.day(x) for x in students}
+    results = []
+
+    def lookup():
+        results.append({x: schedule_index.day(x) for x in students})
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [expected] * 4
+
+
+def test_student_on_two_days():
+    with pytest.raises(ValueError):
+        ScheduleIndex.from_columns([1, 2], ["a", "b"], [1, 2], ["test 1", "test 1"])
+
+
+def test_arrays(schedule_index):
+    rebuilt = ScheduleIndex(schedule_index.arrays())
+
+    for name, array in schedule_index.arrays().items():
+        assert np.array_equal(rebuilt.arrays()[name], array)
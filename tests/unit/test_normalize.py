@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from split_schedule.errors import InvalidInputError
+from split_schedule.normalize import (
+    integer_id_columns,
+    normalize_initial_days,
+    normalize_schedule,
+    restore_id_types,
+)
+from split_schedule.schedule_builder import ScheduleBuilder
+
+
+def test_normalize_schedule():
+    df = pd.DataFrame(
+        {
+            "block": [1, "2", np.nan, 1, 1, "x", 3],
+            "class": [
+                " test  class 1 ",
+                "test class 2",
+                "test class 1",
+                "test class 1",
+                "test class 1",
+                "test class 1",
+                " ",
+            ],
+            "student": ["test 1", "test 1", "test 2", "test 1 ", "test 2", None, "test 3"],
+            "extra": range(7),
+        }
+    )
+    normalized_df, report = normalize_schedule(df)
+
+    assert normalized_df.columns.tolist() == ["block", "class", "student"]
+    assert normalized_df.values.tolist() == [
+        [1, "test class 1", "test 1"],
+        [2, "test class 2", "test 1"],
+        [1, "test class 1", "test 2"],
+    ]
+    assert report == {
+        "total_rows": 7,
+        "null_rows": [2, 5, 6],
+        "duplicate_rows": [3],
+        "conflicts": [],
+    }
+
+
+def test_normalize_schedule_float_ids():
+    df = pd.DataFrame(
+        {"block": [1.0, 1.0], "class": ["test class 1"] * 2, "student": [101.0, None]}
+    )
+    normalized_df, report = normalize_schedule(df)
+
+    assert normalized_df["student"].tolist() == ["101"]
+    assert normalized_df["block"].dtype == int
+    assert report["null_rows"] == [1]
+
+
+def test_normalize_schedule_conflicts():
+    df = pd.DataFrame(
+        {
+            "block": [1, 1, 2],
+            "class": ["test class 1", "test class 2", "test class 3"],
+            "student": ["test 1", "test 1", "test 1"],
+        }
+    )
+
+    with pytest.raises(InvalidInputError) as e:
+        normalize_schedule(df)
+
+    assert e.value.report["conflicts"] == [
+        {"student": "test 1", "block": 1, "classes": ["test class 1", "test class 2"]}
+    ]
+
+
+def test_normalize_schedule_missing_columns():
+    with pytest.raises(InvalidInputError):
+        normalize_schedule(pd.DataFrame({"block": [1], "student": ["test 1"]}))
+
+
+def test_normalize_schedule_empty():
+    with pytest.raises(InvalidInputError):
+        normalize_schedule(pd.DataFrame({"block": [None], "class": ["a"], "student": ["test 1"]}))
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_build_schedule_input_report(caplog, test_schedule_df, verbose):
+    df = pd.concat([test_schedule_df, test_schedule_df.head(2)], ignore_index=True)
+    df.loc[len(df)] = [1, None, "test 1"]
+
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(df, verbose=verbose)
+
+    assert len(schedule_builder.input_report["duplicate_rows"]) == 2
+    assert len(schedule_builder.input_report["null_rows"]) == 1
+
+    if verbose:
+        assert "Dropped 2 duplicate rows" in caplog.text
+        assert "Dropped 1 rows with missing values" in caplog.text
+    else:
+        assert "Dropped" not in caplog.text
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_build_schedule_input_conflict(caplog, test_schedule_df, verbose):
+    df = test_schedule_df.copy()
+    df.loc[len(df)] = [df["block"].iloc[0], "other class", df["student"].iloc[0]]
+
+    schedule_builder = ScheduleBuilder()
+    with pytest.raises(InvalidInputError):
+        schedule_builder.build_schedule_from_df(df, verbose=verbose)
+
+    assert len(schedule_builder.input_report["conflicts"]) == 1
+
+    if verbose:
+        assert "is in more than one class in block" in caplog.text
+    else:
+        assert "is in more than one class in block" not in caplog.text
+
+
+def test_normalize_initial_days():
+    initial_schedule = pd.DataFrame(
+        {
+            "student": [1001, 1001, 1002, " test  3 ", None],
+            "day_number": [2, 2, 1, 3, 1],
+        }
+    )
+
+    assert normalize_initial_days(initial_schedule) == {"1001": 1, "1002": 0, "test 3": 2}
+
+
+def test_integer_id_columns():
+    df = pd.DataFrame(
+        {
+            "block": [1, 2, 3],
+            "class": [101.0, None, 103.0],
+            "student": ["a", "b", "c"],
+        }
+    )
+
+    assert integer_id_columns(df) == ["class"]
+    assert integer_id_columns(df.assign(student=[1, 2, 3])) == ["class", "student"]
+    assert integer_id_columns(df.assign(**{"class": [1.5, 2.0, 3.0]})) == []
+
+
+def test_restore_id_types():
+    df = pd.DataFrame({"class": ["101", "102"], "student": [7, 8]})
+    restored_df = restore_id_types(df, ["class"])
+
+    assert restored_df["class"].tolist() == [101, 102]
+    assert restored_df["student"].tolist() == ["7", "8"]
+    assert restore_id_types(restored_df, ["class"]) is restored_df
@@ -0,0 +1,58 @@
+import pytest
+
+from split_schedule.ordering import order_students
+from split_schedule.schedule_builder import ScheduleBuilder
+from split_schedule.sections import Section
+
+
+@pytest.fixture
+def sections():
+    return [
+        Section(1, "test class 1", 4, 2, 2, 2),
+        Section(2, "test class 2", 2, 1, 2, 2),
+        Section(3, "test class 3", 2, 2, 1, 2),
+    ]
+
+
+def test_order_students_most_classes(sections):
+    student_sections = [[sections[0]], [sections[0], sections[1], sections[2]], [sections[1]]]
+
+    assert list(order_students("most_classes", student_sections, 2)) == [1, 0, 2]
+
+
+def test_order_students_tightest(sections):
+    student_sections = [[sections[2]], [sections[0]], [sections[1]]]
+
+    assert list(order_students("tightest", student_sections, 2)) == [1, 2, 0]
+
+
+def test_order_students_dsatur(sections):
+    student_sections = [[sections[0]], [sections[0], sections[1]], [sections[1]], [sections[0]]]
+    order = order_students("dsatur", student_sections, 2)
+
+    first = next(order)
+    assert first == 1
+
+    sections[0].add(0, first)
+    sections[1].add(0, first)
+
+    # Student 2 now only has day 2 left so it is placed next
+    assert next(order) == 2
+
+
+def test_order_students_dsatur_initial_full_day(sections):
+    sections[0].add(0, 5)
+    sections[0].add(0, 6)
+    student_sections = [[sections[2]], [sections[0]]]
+
+    assert list(order_students("dsatur", student_sections, 2)) == [1, 0]
+
+
+def test_order_students_unknown(sections):
+    with pytest.raises(ValueError):
+        order_students("unknown", [[sections[0]]], 2)
+
+
+def test_schedule_builder_unknown_ordering():
+    with pytest.raises(ValueError):
+        ScheduleBuilder(ordering="unknown")
@@ -0,0 +1,75 @@
+import pytest
+
+from split_schedule.core import ScheduleEngine
+from split_schedule.portfolio import PORTFOLIO_STRATEGIES, StrategyPortfolio
+from tests.conftest import mock_data
+
+
+def test_select_tries_each_strategy_first():
+    portfolio = StrategyPortfolio(PORTFOLIO_STRATEGIES)
+
+    selected = []
+    for _ in PORTFOLIO_STRATEGIES:
+        selected.append(portfolio.select())
+        portfolio.update(selected[-1], 0.5, False)
+
+    assert selected == list(range(len(PORTFOLIO_STRATEGIES)))
+
+
+def test_select_prefers_best_strategy():
+    portfolio = StrategyPortfolio(PORTFOLIO_STRATEGIES[:3], exploration=0.01)
+    for i, reward in enumerate([0.5, 1.0, 0.7]):
+        portfolio.update(i, reward, reward == 1.0)
+
+    assert portfolio.select() == 1
+
+
+def test_stats():
+    portfolio = StrategyPortfolio(PORTFOLIO_STRATEGIES[:2])
+    portfolio.update(0, 0.5, False)
+    portfolio.update(0, 1.0, True)
+
+    stats = portfolio.stats()
+
+    assert stats[0]["ordering"] == PORTFOLIO_STRATEGIES[0]["ordering"]
+    assert stats[0]["tries"] == 2
+    assert stats[0]["successes"] == 1
+    assert stats[0]["mean_reward"] == 0.75
+    assert stats[1]["tries"] == 0
+    assert stats[1]["mean_reward"] == 0.0
+
+
+@pytest.mark.parametrize(
+    "strategies",
+    [
+        [],
+        [{"ordering": "bad", "day_policy": "random", "backtrack_depth": 0}],
+        [{"ordering": "matches", "day_policy": "bad", "backtrack_depth": 0}],
+        [{"ordering": "matches", "day_policy": "random", "backtrack_depth": -1}],
+    ],
+)
+def test_invalid_strategies(strategies):
+    with pytest.raises(ValueError):
+        ScheduleEngine(portfolio=strategies)
+
+
+def test_fill_attempt_restores_strategy(monkeypatch):
+    schedule_engine = ScheduleEngine(portfolio=PORTFOLIO_STRATEGIES[1:])
+    schedule_engine._set_columns(mock_data["block"], mock_data["class"], mock_data["student"])
+
+    used = []
+
+    def mock_fill_classes(*args, **kwargs):
+        used.append((schedule_engine._ordering, schedule_engine._backtrack_depth))
+        return None
+
+    monkeypatch.setattr(schedule_engine, "_fill_classes", mock_fill_classes)
+    classes = schedule_engine._init_classes(0.5, 1)
+    for _ in range(len(PORTFOLIO_STRATEGIES) - 1):
+        schedule_engine._fill_attempt(classes, schedule_engine._get_cached_student_classes())
+        schedule_engine._attempt += 1
+
+    assert used == [(x["ordering"], x["backtrack_depth"]) for x in PORTFOLIO_STRATEGIES[1:]]
+    assert schedule_engine._ordering == "matches"
+    assert schedule_engine._backtrack_depth == 0
+    assert [x["tries"] for x in schedule_engine._portfolio.stats()] == [1] * len(used)
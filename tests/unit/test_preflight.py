@@ -0,0 +1,56 @@
+import pytest
+
+from split_schedule.errors import InfeasibleScheduleError, SchedulingError
+from split_schedule.preflight import find_violations
+from split_schedule.schedule_builder import ScheduleBuilder
+
+
+def reduced_class(block, class_name, total_students, max_students):
+    return {
+        "block": block,
+        "class_name": class_name,
+        "total_students": total_students,
+        "max_students": max_students,
+        "num_classes": 1,
+    }
+
+
+def test_find_violations_pass():
+    reduced_classes = [
+        reduced_class(1, "test class 1", 3, 2),
+        reduced_class(2, "test class 2", 2, 1),
+        reduced_class(2, "test class 3", 1, 1),
+    ]
+
+    assert find_violations(reduced_classes) == []
+
+
+def test_find_violations_no_students_allowed():
+    reduced_classes = [
+        reduced_class(1, "test class 1", 3, 0),
+        reduced_class(2, "test class 2", 2, 1),
+        reduced_class(2, "test class 3", 1, 1),
+    ]
+    violations = find_violations(reduced_classes)
+
+    assert [(x["block"], x["class_name"]) for x in violations] == [(1, "test class 1")]
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_build_schedule_infeasible(monkeypatch, caplog, verbose, test_schedule_df):
+    def mock_fill_classes(*args, **kwargs):
+        raise AssertionError("Classes should not be filled")
+
+    monkeypatch.setattr(ScheduleBuilder, "_fill_classes", mock_fill_classes)
+    schedule_builder = ScheduleBuilder()
+
+    with pytest.raises(InfeasibleScheduleError) as e:
+        schedule_builder.build_schedule_from_df(test_schedule_df, 0.01, 0, verbose=verbose)
+
+    assert isinstance(e.value, SchedulingError)
+    assert len(e.value.violations) > 0
+
+    if verbose:
+        assert "The class does not allow any students" in caplog.text
+    else:
+        assert "The class does not allow any students" not in caplog.text
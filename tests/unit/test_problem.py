@@ -0,0 +1,115 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from split_schedule.core import ScheduleEngine
+from split_schedule.problem import (
+    EncodedProblem,
+    SharedProblem,
+    attach_problem,
+    build_assignment,
+    load_problem,
+    save_problem,
+)
+from tests.conftest import mock_data
+
+
+@pytest.fixture
+def problem():
+    return EncodedProblem.from_columns(mock_data["block"], mock_data["class"], mock_data["student"])
+
+
+def test_encoded_problem(class_size_check, problem, student_classes_check):
+    schedule_engine = ScheduleEngine()
+    schedule_engine._set_columns(mock_data["block"], mock_data["class"], mock_data["student"])
+
+    assert list(problem.student_classes()) == list(schedule_engine._get_student_classes())
+    assert problem.student_classes() == student_classes_check
+    assert problem.class_sizes() == class_size_check
+    assert problem.student_offsets[-1] == len(mock_data["student"])
+    assert len(problem.student_offsets) == len(problem.student_names) + 1
+
+
+def test_encoded_problem_numpy(problem):
+    numpy_problem = EncodedProblem.from_columns(
+        np.array(mock_data["block"]), np.array(mock_data["class"]), np.array(mock_data["student"])
+    )
+
+    for name, array in problem.arrays().items():
+        assert np.array_equal(numpy_problem.arrays()[name], array)
+
+
+def test_shared_problem(problem):
+    with SharedProblem(problem) as shared_problem:
+        attached = attach_problem(shared_problem.handle)
+
+        assert attached.student_classes() == problem.student_classes()
+        for name, array in problem.arrays().items():
+            assert np.array_equal(attached.arrays()[name], array)
+
+        del attached
+
+    with pytest.raises(FileNotFoundError):
+        attach_problem(shared_problem.handle)
+
+
+def test_build_assignment(problem):
+    days = build_assignment(problem, 0.5)
+    student_classes = problem.student_classes()
+
+    assert days.dtype == np.int16
+    assert len(days) == len(student_classes)
+    assert days.min() >= 1
+
+    for block, class_name, max_students in [
+        (c["block"], c["class_name"], max(c["total_students"] // 2, 1))
+        for c in problem.class_sizes()
+    ]:
+        class_days = [
+            day
+            for student, day in zip(student_classes, days)
+            if student_classes[student]["blocks"].get(block) == class_name
+        ]
+        assert max(np.bincount(class_days)) <= max_students
+
+
+def test_build_assignment_workers(problem):
+    with SharedProblem(problem) as shared_problem, ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(build_assignment, [shared_problem.handle] * 2, [0.5] * 2))
+
+    assert [len(x) for x in results] == [len(problem.student_names)] * 2
+
+
+def test_save_load_problem(problem, tmp_path):
+    save_problem(problem, tmp_path / "problem")
+    loaded = load_problem(tmp_path / "problem")
+
+    assert isinstance(loaded.student_offsets, np.memmap)
+    assert loaded.student_classes() == problem.student_classes()
+    for name, array in problem.arrays().items():
+        assert np.array_equal(loaded.arrays()[name], array)
+
+
+def test_load_problem_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_problem(tmp_path)
+
+
+def test_load_problem_bad_version(problem, tmp_path):
+    save_problem(problem, tmp_path)
+    header = json.loads((tmp_path / "header.json").read_text())
+    header["version"] += 1
+    (tmp_path / "header.json").write_text(json.dumps(header))
+
+    with pytest.raises(ValueError):
+        load_problem(tmp_path)
+
+
+def test_encoded_problem_columns(problem):
+    columns = problem.columns()
+    rows = set(zip(mock_data["block"], mock_data["class"], mock_data["student"]))
+
+    assert set(zip(columns["block"].tolist(), columns["class"], columns["student"])) == rows
+    assert len(columns["block"]) == len(rows)
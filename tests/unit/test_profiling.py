@@ -0,0 +1,97 @@
+import tracemalloc
+
+import pytest
+
+from split_schedule.profiling import MemoryProfiler
+from split_schedule.schedule_builder import ScheduleBuilder
+
+
+def test_memory_profiler_phase():
+    profiler = MemoryProfiler()
+    profiler.start()
+    with profiler.phase("allocate", 1):
+        kept = [0] * 100_000
+        temporary = [0] * 200_000
+        del temporary
+    profiler.stop()
+
+    assert not tracemalloc.is_tracing()
+    assert len(kept) == 100_000
+    assert profiler.stats[0]["attempt"] == 1
+    assert profiler.stats[0]["phase"] == "allocate"
+    assert profiler.stats[0]["peak_bytes"] >= 300_000 * 8
+    assert 100_000 * 8 <= profiler.stats[0]["net_bytes"] < 200_000 * 8
+
+
+def test_memory_profiler_nested_phase():
+    profiler = MemoryProfiler()
+    profiler.start()
+    with profiler.phase("outer"):
+        with profiler.phase("inner"):
+            temporary = [0] * 200_000
+            del temporary
+    profiler.stop()
+
+    inner, outer = profiler.stats
+
+    assert inner["phase"] == "inner"
+    assert outer["phase"] == "outer"
+    assert outer["peak_bytes"] >= inner["peak_bytes"] >= 200_000 * 8
+
+
+def test_memory_profiler_no_reset_peak(monkeypatch):
+    monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    profiler = MemoryProfiler()
+    profiler.start()
+    with profiler.phase("outer"):
+        temporary = [0] * 400_000
+        del temporary
+        with profiler.phase("small"):
+            small = [0] * 10_000
+            del small
+        with profiler.phase("large"):
+            temporary = [0] * 800_000
+            del temporary
+    profiler.stop()
+
+    small, large, outer = profiler.stats
+
+    assert small["peak_bytes"] < 400_000 * 8
+    assert large["peak_bytes"] >= 800_000 * 8
+    assert outer["peak_bytes"] >= large["peak_bytes"]
+
+
+def test_memory_profiler_already_tracing():
+    tracemalloc.start()
+    profiler = MemoryProfiler()
+    profiler.start()
+    profiler.stop()
+
+    assert tracemalloc.is_tracing()
+
+    tracemalloc.stop()
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_build_schedule_profile_memory(caplog, test_schedule, verbose):
+    schedule_builder = ScheduleBuilder(profile_memory=True)
+    schedule_builder.build_schedule_from_file(test_schedule, verbose=verbose)
+    stats_df = schedule_builder.memory_stats_df
+
+    assert stats_df.columns.values.tolist() == ["attempt", "phase", "peak_bytes", "net_bytes"]
+    assert {"read_file", "fill_classes", "validate"} <= set(stats_df["phase"])
+    assert stats_df.loc[stats_df["phase"] == "read_file", "attempt"].isna().all()
+    assert (stats_df["peak_bytes"] >= 0).all()
+    assert not tracemalloc.is_tracing()
+
+    if verbose:
+        assert "Peak memory" in caplog.text
+    else:
+        assert "Peak memory" not in caplog.text
+
+
+def test_build_schedule_no_profile_memory(test_schedule_df):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df)
+
+    assert schedule_builder.memory_stats_df is None
@@ -0,0 +1,46 @@
+import numpy as np
+
+from split_schedule.report import build_report
+
+
+def test_build_report_sections(final_schedule_df):
+    report = build_report(final_schedule_df)
+    sections_df = report["sections"].set_index(["block", "class", "day_number"])
+    counts = final_schedule_df.groupby(["block", "class", "day_number"]).size()
+
+    assert (
+        len(sections_df)
+        == final_schedule_df[["block", "class"]].drop_duplicates().shape[0]
+        * final_schedule_df["day_number"].max()
+    )
+    assert sections_df["students"].sum() == len(final_schedule_df)
+    assert (sections_df.loc[counts.index, "students"] == counts).all()
+    assert np.allclose(
+        sections_df["fill_ratio"], sections_df["students"] / sections_df["max_students"]
+    )
+
+
+def test_build_report_days_blocks_students(final_schedule_df):
+    report = build_report(final_schedule_df)
+    day_students = final_schedule_df.groupby("day_number")["student"].nunique()
+    block_counts = final_schedule_df.groupby(["block", "day_number"]).size()
+    student_classes = final_schedule_df.groupby("student").size()
+
+    assert report["days"].set_index("day_number")["students"].to_dict() == day_students.to_dict()
+    assert report["days"]["enrollments"].sum() == len(final_schedule_df)
+    assert (
+        report["blocks"].set_index(["block", "day_number"]).loc[block_counts.index, "students"]
+        == block_counts
+    ).all()
+    assert report["students"].set_index("student")["classes"].to_dict() == (
+        student_classes.to_dict()
+    )
+
+
+def test_build_report_imbalance(final_schedule_df):
+    imbalance = build_report(final_schedule_df)["imbalance"]
+    day_students = final_schedule_df.groupby("day_number")["student"].nunique()
+
+    assert imbalance["day_student_spread"] == day_students.max() - day_students.min()
+    assert imbalance["overfull_sections"] == 0
+    assert 0 < imbalance["mean_fill_ratio"] <= imbalance["max_fill_ratio"] <= 1
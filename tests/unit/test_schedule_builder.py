@@ -1,11 +1,21 @@
-import logging
+import asyncio
+import threading
+import time
 
 import pandas as pd
 import pytest
 
+from split_schedule.cache import MemoryCache
 from split_schedule.errors import NoScheduleError
+from split_schedule.portfolio import PORTFOLIO_STRATEGIES
 from split_schedule.schedule_builder import ScheduleBuilder, SchedulingError
-from tests.helpers import init_classes_check, reduce_classes_check, total_classes_check
+from split_schedule.sections import Section
+from tests.helpers import (
+    init_classes_check,
+    reduce_classes_check,
+    section_values,
+    total_classes_check,
+)
 
 
 @pytest.mark.parametrize("max_tries", [1, 2])
@@ -222,22 +232,8 @@ def test_fill_classes_match_no_space(tmp_path):
     df.to_excel(test_file, index=False, engine="openpyxl")
 
     fill_classes = [
-        {
-            "block": 1,
-            "class_name": "test class 1",
-            "total_students": 2,
-            "max_students": 1,
-            "num_classes": 1,
-            "classes": [set()],
-        },
-        {
-            "block": 2,
-            "class_name": "test class 2",
-            "total_students": 2,
-            "max_students": 1,
-            "num_classes": 1,
-            "classes": [set()],
-        },
+        Section(1, "test class 1", 2, 1, 1, 1),
+        Section(2, "test class 2", 2, 1, 1, 1),
     ]
 
     student_classes_grouped = {
@@ -267,16 +263,7 @@ def test_fill_classes_no_match_no_space(tmp_path):
     df = pd.DataFrame(data)
     df.to_excel(test_file, index=False, engine="openpyxl")
 
-    fill_classes = [
-        {
-            "block": 1,
-            "class_name": "test class 1",
-            "total_students": 1,
-            "max_students": 0,
-            "num_classes": 1,
-            "classes": [set()],
-        },
-    ]
+    fill_classes = [Section(1, "test class 1", 1, 0, 1, 1)]
 
     student_classes_grouped = {
         "test 1": {"blocks": {1: "test class 1", 2: "test class 2"}},
@@ -308,22 +295,8 @@ def test_fill_classes_match_move_day(tmp_path):
     df.to_excel(test_file, index=False, engine="openpyxl")
 
     fill_classes = [
-        {
-            "block": 1,
-            "class_name": "test class 1",
-            "total_students": 3,
-            "max_students": 2,
-            "num_classes": 2,
-            "classes": [set(), set()],
-        },
-        {
-            "block": 2,
-            "class_name": "test class 2",
-            "total_students": 3,
-            "max_students": 2,
-            "num_classes": 2,
-            "classes": [set(), set()],
-        },
+        Section(1, "test class 1", 3, 2, 2, 2),
+        Section(2, "test class 2", 3, 2, 2, 2),
     ]
 
     student_classes_grouped = {
@@ -336,7 +309,7 @@ def test_fill_classes_match_move_day(tmp_path):
     schedule_builder.build_schedule_from_file(test_file)
 
     fill_classes = schedule_builder._fill_classes(fill_classes, student_classes_grouped)
-    class_size = [sorted([len(y) for y in x["classes"]]) for x in fill_classes]
+    class_size = [sorted(x.counts) for x in fill_classes]
 
     expected = [[1, 2], [1, 2]]
     assert expected == class_size
@@ -350,89 +323,6 @@ def test_find_matches(student_matches_check, test_schedule):
     assert matches == student_matches_check
 
 
-def test_find_matches_unused_order_found(tmp_path, caplog):
-    test_file = str(tmp_path.joinpath("data1.xlsx"))
-    data = {
-        "block": [1, 1, 2, 2],
-        "class": [
-            "test class 1",
-            "test class 1",
-            "test class 2",
-            "test class 2",
-        ],
-        "student": ["test 1", "test 2", "test 1", "test 2"],
-    }
-
-    df = pd.DataFrame(data)
-    df.to_excel(test_file, index=False, engine="openpyxl")
-
-    class TestingScheduleBuilder(ScheduleBuilder):
-        def __init__(self, schedule_file_path):
-            self.final_schedule_df = None
-
-            self._schedule_df = self._load_data(schedule_file_path)
-            self._attempted_df = [df]
-            self._attempt = 1
-            self._verbose = True
-
-            logging.basicConfig(format="%(asctime)s: %(levelname)s: %(message)s")
-            logging.root.setLevel(level=logging.INFO)
-            self._logger = logging.getLogger()
-
-    schedule_builder = TestingScheduleBuilder(test_file)
-    schedule_builder._find_matches()
-
-    assert "Unused student order found" in caplog.text
-
-
-def test_find_matches_unused_order_not_found(tmp_path, caplog):
-    test_file = str(tmp_path.joinpath("data1.xlsx"))
-    data_1 = {
-        "block": [1, 1, 2, 2],
-        "class": [
-            "test class 1",
-            "test class 1",
-            "test class 2",
-            "test class 2",
-        ],
-        "student": ["test 1", "test 2", "test 1", "test 2"],
-    }
-
-    df_1 = pd.DataFrame(data_1)
-    df_1.to_excel(test_file, index=False, engine="openpyxl")
-
-    data_2 = {
-        "block": [1, 1, 2, 2],
-        "class": [
-            "test class 1",
-            "test class 1",
-            "test class 2",
-            "test class 2",
-        ],
-        "student": ["test 2", "test 1", "test 2", "test 1"],
-    }
-
-    df_2 = pd.DataFrame(data_2)
-
-    class TestingScheduleBuilder(ScheduleBuilder):
-        def __init__(self, schedule_file_path):
-            self.final_schedule_df = None
-
-            self._schedule_df = self._load_data(schedule_file_path)
-            self._attempted_df = [df_1, df_2]
-            self._attempt = 1
-            self._verbose = True
-
-            logging.basicConfig(format="%(asctime)s: %(levelname)s: %(message)s")
-            logging.root.setLevel(level=logging.INFO)
-            self._logger = logging.getLogger()
-
-    schedule_builder = TestingScheduleBuilder(test_file)
-    schedule_builder._find_matches()
-
-    assert "No unused matches found" in caplog.text
-
-
 def test_find_matches_retry(student_matches_check, test_schedule):
     schedule_builder = ScheduleBuilder()
     schedule_builder.build_schedule_from_file(test_schedule)
@@ -483,7 +373,7 @@ def test_init_classes(class_size_check, reduce_by, smallest_allowed, test_schedu
     schedule_builder.build_schedule_from_file(test_schedule)
     classes = schedule_builder._init_classes(reduce_by, smallest_allowed)
 
-    assert classes == expected
+    assert section_values(classes) == section_values(expected)
 
 
 def test_init_schedule_builder(test_schedule):
@@ -874,3 +764,327 @@ def test_save_schedule_file_error(tmp_path, test_schedule):
         schedule_bulder = ScheduleBuilder()
         schedule_bulder.build_schedule_from_file(test_schedule)
         schedule_bulder.save_schedule(tmp_path / "bad.xyz")
+
+
+def test_abuild_schedule_cancelled(monkeypatch, test_schedule_df):
+    started = threading.Event()
+    calls = []
+
+    def mock_fill_classes(*args, **kwargs):
+        started.set()
+        calls.append(1)
+        time.sleep(0.01)
+        return None
+
+    schedule_builder = ScheduleBuilder()
+    monkeypatch.setattr(ScheduleBuilder, "_fill_classes", mock_fill_classes)
+
+    async def build():
+        task = asyncio.create_task(
+            schedule_builder.abuild_schedule_from_df(test_schedule_df, max_tries=1000)
+        )
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(build())
+    total_calls = len(calls)
+    time.sleep(0.05)
+
+    assert total_calls < 1000
+    assert len(calls) == total_calls
+
+
+def test_abuild_schedule_cancelled_then_rebuilt(monkeypatch, test_schedule_df):
+    started = threading.Event()
+    running = []
+    max_running = []
+    fill_classes = ScheduleBuilder._fill_classes
+
+    def mock_fill_classes(self, *args, **kwargs):
+        running.append(1)
+        max_running.append(len(running))
+        started.set()
+        time.sleep(0.01)
+        running.pop()
+        if self._attempt < 5:
+            return None
+        return fill_classes(self, *args, **kwargs)
+
+    schedule_builder = ScheduleBuilder()
+    monkeypatch.setattr(ScheduleBuilder, "_fill_classes", mock_fill_classes)
+
+    async def build():
+        task = asyncio.create_task(
+            schedule_builder.abuild_schedule_from_df(test_schedule_df, 0.5, max_tries=1000)
+        )
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        task.cancel()
+        await schedule_builder.abuild_schedule_from_df(test_schedule_df, 0.5, max_tries=10)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(build())
+
+    assert max(max_running) == 1
+    assert schedule_builder.final_schedule_df is not None
+
+
+def test_asave_schedule_no_schedule_error(tmp_path):
+    schedule_builder = ScheduleBuilder()
+    with pytest.raises(NoScheduleError):
+        asyncio.run(schedule_builder.asave_schedule(tmp_path.joinpath("schedule.xlsx")))
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_build_schedule_blocked_sections(caplog, verbose):
+    df = pd.DataFrame(
+        {
+            "block": [1, 2, 2, 3, 3, 1],
+            "class": [
+                "test class 1",
+                "test class 2",
+                "test class 2",
+                "test class 3",
+                "test class 3",
+                "test class 1",
+            ],
+            "student": ["test 1", "test 1", "test 2", "test 2", "test 3", "test 3"],
+        }
+    )
+
+    schedule_builder = ScheduleBuilder()
+    with pytest.raises(SchedulingError) as e:
+        schedule_builder.build_schedule_from_df(df, 0.5, max_tries=3, verbose=verbose)
+
+    blocked = {(x["block"], x["class_name"]) for x in e.value.blocked_sections}
+
+    assert blocked
+    assert blocked <= {(1, "test class 1"), (2, "test class 2"), (3, "test class 3")}
+    assert sum(x["times_blocked"] for x in e.value.blocked_sections) >= 3
+
+    if verbose:
+        assert "Classes that most often had no room" in caplog.text
+    else:
+        assert "Classes that most often had no room" not in caplog.text
+
+
+@pytest.mark.parametrize("verbose", [True, False])
+def test_build_schedule_initial_schedule_keeps_days(caplog, test_schedule_df, verbose):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df)
+    initial_schedule = schedule_builder.final_schedule_df
+
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(
+        test_schedule_df, verbose=verbose, initial_schedule=initial_schedule
+    )
+
+    initial_days = initial_schedule.groupby("student")["day_number"].first()
+    days = schedule_builder.final_schedule_df.groupby("student")["day_number"].first()
+
+    assert days.equals(initial_days)
+
+    if verbose:
+        assert "students kept their previous day" in caplog.text
+    else:
+        assert "students kept their previous day" not in caplog.text
+
+
+def test_build_schedule_initial_schedule_new_student(test_schedule_df):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df)
+    initial_schedule = schedule_builder.final_schedule_df
+
+    first_student = test_schedule_df["student"].iloc[0]
+    new_student_df = test_schedule_df.loc[test_schedule_df["student"] == first_student].assign(
+        student="new student"
+    )
+    df = pd.concat([test_schedule_df, new_student_df], ignore_index=True)
+    schedule_builder.build_schedule_from_df(df, initial_schedule=initial_schedule)
+
+    initial_days = initial_schedule.groupby("student")["day_number"].first()
+    days = schedule_builder.final_schedule_df.groupby("student")["day_number"].first()
+
+    assert "new student" in days.index
+    assert (days.drop("new student") == initial_days).mean() > 0.9
+
+
+def test_build_schedule_initial_schedule_numeric_ids_from_csv(tmp_path, test_schedule_df):
+    df = test_schedule_df.copy()
+    df["student"] = df["student"].factorize()[0] + 1000
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(df)
+    schedule_builder.save_schedule(tmp_path.joinpath("previous.csv"))
+    initial_schedule = pd.read_csv(tmp_path.joinpath("previous.csv"))
+
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(df, initial_schedule=initial_schedule)
+
+    initial_days = initial_schedule.groupby("student")["day_number"].first()
+    days = schedule_builder.final_schedule_df.groupby("student")["day_number"].first()
+
+    assert set(schedule_builder._initial_days) == set(df["student"].astype(str))
+    assert days.tolist() == initial_days.tolist()
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_build_schedule_integer_ids(use_cache, test_schedule_df):
+    df = test_schedule_df.copy()
+    df["class"] = df["class"].factorize()[0] + 100
+    df["student"] = df["student"].factorize()[0] + 1000
+    cache = MemoryCache() if use_cache else None
+
+    # The text version of the same class list is built first so a cached schedule has text ids
+    schedule_builder = ScheduleBuilder(cache=cache)
+    schedule_builder.build_schedule_from_df(df.astype({"class": str, "student": str}))
+    text_schedule_df = schedule_builder.final_schedule_df
+    schedule_builder.build_schedule_from_df(df)
+    final_schedule_df = schedule_builder.final_schedule_df
+
+    assert text_schedule_df["student"].map(type).eq(str).all()
+    assert pd.api.types.is_integer_dtype(final_schedule_df["class"])
+    assert pd.api.types.is_integer_dtype(final_schedule_df["student"])
+    assert set(final_schedule_df["student"]) == set(df["student"])
+    assert set(final_schedule_df["class"]) == set(df["class"])
+
+
+def test_build_schedule_initial_schedule_missing_columns(test_schedule_df):
+    schedule_builder = ScheduleBuilder()
+    with pytest.raises(ValueError):
+        schedule_builder.build_schedule_from_df(test_schedule_df, initial_schedule=test_schedule_df)
+
+
+def test_fill_classes_initial_schedule_moves_blocking_student():
+    fill_classes = [
+        Section(1, "test class 1", 2, 1, 2, 2),
+        Section(2, "test class 2", 2, 1, 2, 2),
+    ]
+    student_classes_grouped = {
+        "test 1": {"blocks": {1: "test class 1"}},
+        "test 2": {"blocks": {2: "test class 2"}},
+        "test 3": {"blocks": {1: "test class 1", 2: "test class 2"}},
+    }
+
+    schedule_builder = ScheduleBuilder(ordering="most_classes")
+    schedule_builder._initial_days = {"test 1": 1, "test 2": 0}
+    fill_classes = schedule_builder._fill_classes(fill_classes, student_classes_grouped)
+
+    assert fill_classes
+    assert fill_classes[0].counts == [1, 1]
+    assert fill_classes[1].counts == [1, 1]
+    assert fill_classes[0].rosters in ([{2}, {0}], [{0}, {2}])
+    assert fill_classes[1].rosters in ([{2}, {1}], [{1}, {2}])
+
+
+def test_build_schedule_from_problem(test_schedule_df, tmp_path):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+    schedule_builder.export_problem(tmp_path / "problem")
+
+    problem_builder = ScheduleBuilder()
+    problem_builder.build_schedule_from_problem(tmp_path / "problem", 0.5)
+
+    assert problem_builder.final_schedule_df is not None
+    assert sorted(problem_builder.final_schedule_df["student"].unique()) == sorted(
+        test_schedule_df["student"].unique()
+    )
+    assert len(problem_builder.final_schedule_df) == len(test_schedule_df)
+
+
+def test_export_problem_no_class_list(tmp_path):
+    with pytest.raises(ValueError):
+        schedule_builder = ScheduleBuilder()
+        schedule_builder.export_problem(tmp_path / "problem")
+
+
+def test_report(test_schedule_df):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+    report = schedule_builder.report()
+
+    assert set(report) == {"sections", "days", "blocks", "students", "imbalance"}
+    assert len(report["students"]) == test_schedule_df["student"].nunique()
+
+
+def test_report_no_schedule_error():
+    with pytest.raises(NoScheduleError):
+        schedule_builder = ScheduleBuilder()
+        schedule_builder.report()
+
+
+def test_build_schedule_backtrack_depth(test_schedule_df):
+    schedule_builder = ScheduleBuilder(backtrack_depth=8)
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+
+    assert schedule_builder.final_schedule_df is not None
+    assert len(schedule_builder.final_schedule_df) == len(test_schedule_df)
+    assert schedule_builder._build_options()["backtrack_depth"] == 8
+
+
+def test_build_schedule_portfolio(test_schedule_df):
+    schedule_builder = ScheduleBuilder(portfolio=PORTFOLIO_STRATEGIES)
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+
+    assert schedule_builder.final_schedule_df is not None
+    assert len(schedule_builder.final_schedule_df) == len(test_schedule_df)
+    assert schedule_builder._portfolio.stats()[0]["successes"] == 1
+
+
+def test_save_rosters(test_schedule_df, tmp_path):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+    paths = schedule_builder.save_rosters(tmp_path, by="class")
+
+    assert len(paths) == len(test_schedule_df[["block", "class"]].drop_duplicates())
+    assert all(x.exists() for x in paths)
+
+
+def test_save_rosters_no_schedule_error(tmp_path):
+    with pytest.raises(NoScheduleError):
+        schedule_builder = ScheduleBuilder()
+        schedule_builder.save_rosters(tmp_path)
+
+
+def test_schedule_index(test_schedule_df):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+    schedule_index = schedule_builder.schedule_index()
+
+    student = test_schedule_df["student"].iloc[0]
+    final_schedule_df = schedule_builder.final_schedule_df
+    assert schedule_index.day(student) == (
+        final_schedule_df[final_schedule_df["student"] == student]["day_number"].iloc[0]
+    )
+
+
+def test_schedule_index_no_schedule_error():
+    with pytest.raises(NoScheduleError):
+        schedule_builder = ScheduleBuilder()
+        schedule_builder.schedule_index()
+
+
+def test_save_load_snapshot(test_schedule_df, tmp_path):
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5)
+    schedule_builder.save_snapshot(tmp_path / "schedule.snapshot")
+
+    snapshot_builder = ScheduleBuilder()
+    snapshot_builder.load_snapshot(tmp_path / "schedule.snapshot")
+
+    sort_columns = ["day_number", "block", "class", "student"]
+    pd.testing.assert_frame_equal(
+        snapshot_builder.final_schedule_df.sort_values(sort_columns, ignore_index=True),
+        schedule_builder.final_schedule_df.sort_values(sort_columns, ignore_index=True),
+        check_dtype=False,
+    )
+    assert snapshot_builder._build_params["reduce_by"] == 0.5
+
+
+def test_save_snapshot_no_schedule_error(tmp_path):
+    with pytest.raises(NoScheduleError):
+        schedule_builder = ScheduleBuilder()
+        schedule_builder.save_snapshot(tmp_path / "schedule.snapshot")
@@ -0,0 +1,43 @@
+from split_schedule.sections import Section
+
+
+def test_section_add():
+    section = Section(1, "test class 1", 3, 2, 2, 2)
+    section.add(0, 0)
+    section.add(0, 5)
+    section.add(1, 70)
+
+    assert section.counts == [2, 1]
+    assert list(section.student_codes(0)) == [0, 5]
+    assert list(section.student_codes(1)) == [70]
+
+
+def test_section_has_room():
+    section = Section(1, "test class 1", 3, 2, 2, 2)
+    section.add(0, 0)
+
+    assert section.has_room(0)
+    assert not section.has_full_day()
+
+    section.add(0, 1)
+
+    assert not section.has_room(0)
+    assert section.has_room(1)
+    assert section.has_full_day()
+
+
+def test_section_empty_roster():
+    section = Section(1, "test class 1", 3, 2, 2, 2)
+
+    assert list(section.student_codes(1)) == []
+
+
+def test_section_remove():
+    section = Section(1, "test class 1", 3, 2, 2, 2)
+    section.add(0, 0)
+    section.add(0, 5)
+    section.remove(0, 0)
+
+    assert section.counts == [1, 0]
+    assert list(section.student_codes(0)) == [5]
+    assert section.has_room(0)
@@ -0,0 +1,67 @@
+import struct
+
+import pytest
+
+from split_schedule.core import SCHEDULE_COLUMNS
+from split_schedule.index import ScheduleIndex
+from split_schedule.snapshot import SNAPSHOT_VERSION, load_snapshot, save_snapshot
+
+
+@pytest.fixture
+def columns(final_schedule_df):
+    return {x: final_schedule_df[x].tolist() for x in SCHEDULE_COLUMNS}
+
+
+def test_save_load_snapshot(columns, tmp_path):
+    save_snapshot(columns, tmp_path / "schedule.snapshot", {"reduce_by": 0.5})
+    snapshot = load_snapshot(tmp_path / "schedule.snapshot")
+    loaded = snapshot.columns()
+
+    assert snapshot.params == {"reduce_by": 0.5}
+    assert list(loaded) == list(SCHEDULE_COLUMNS)
+    assert sorted(zip(*loaded.values())) == sorted(zip(*columns.values()))
+    assert not (tmp_path / "schedule.snapshot.tmp").exists()
+
+
+def test_snapshot_index(columns, tmp_path):
+    save_snapshot(columns, tmp_path / "schedule.snapshot")
+    snapshot_index = load_snapshot(tmp_path / "schedule.snapshot").index
+    schedule_index = ScheduleIndex.from_columns(
+        columns["block"], columns["class"], columns["day_number"], columns["student"]
+    )
+
+    assert not snapshot_index.student_days.flags.writeable
+    for student in columns["student"]:
+        assert snapshot_index.day(student) == schedule_index.day(student)
+        assert snapshot_index.sections(student) == schedule_index.sections(student)
+
+    for block, class_name, day_number in zip(
+        columns["block"], columns["class"], columns["day_number"]
+    ):
+        assert snapshot_index.roster(block, class_name, day_number) == schedule_index.roster(
+            block, class_name, day_number
+        )
+
+
+def test_load_snapshot_not_snapshot(tmp_path):
+    (tmp_path / "schedule.csv").write_text("block,class,student\n" * 10)
+
+    with pytest.raises(ValueError):
+        load_snapshot(tmp_path / "schedule.csv")
+
+
+def test_load_snapshot_bad_version(columns, tmp_path):
+    save_snapshot(columns, tmp_path / "schedule.snapshot")
+    data = bytearray((tmp_path / "schedule.snapshot").read_bytes())
+    struct.pack_into("<Q", data, 8, SNAPSHOT_VERSION + 1)
+    (tmp_path / "schedule.snapshot").write_bytes(data)
+
+    with pytest.raises(ValueError):
+        load_snapshot(tmp_path / "schedule.snapshot")
+
+
+def test_save_snapshot_missing_columns(columns, tmp_path):
+    del columns["max_students"]
+
+    with pytest.raises(ValueError):
+        save_snapshot(columns, tmp_path / "schedule.snapshot")
@@ -0,0 +1,146 @@
+import pytest
+
+from split_schedule.core import SCHEDULE_COLUMNS, ScheduleEngine
+from split_schedule.errors import SchedulingError
+from split_schedule.problem import EncodedProblem
+from split_schedule.schedule_builder import ScheduleBuilder
+from split_schedule.sweep import find_min_reduce_by, sweep
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep(workers, test_schedule_df):
+    result = sweep(test_schedule_df, [0.1, 0.5], [1, 10], workers=workers)
+
+    assert result.columns.values.tolist() == [
+        "reduce_by",
+        "smallest_allowed",
+        "feasible",
+        "days",
+        "attempts",
+        "seconds",
+    ]
+    assert result[["reduce_by", "smallest_allowed"]].values.tolist() == [
+        [0.1, 1],
+        [0.1, 10],
+        [0.5, 1],
+        [0.5, 10],
+    ]
+    assert result["feasible"].all()
+
+
+def test_sweep_days(test_schedule_df):
+    result = sweep(test_schedule_df, 0.5, 1)
+
+    schedule_builder = ScheduleBuilder()
+    schedule_builder.build_schedule_from_df(test_schedule_df, 0.5, 1)
+
+    assert len(result) == 1
+    assert result["days"][0] == schedule_builder.final_schedule_df["day_number"].max()
+
+
+def test_sweep_infeasible(monkeypatch, test_schedule_df):
+    def mock_return(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(ScheduleEngine, "_fill_classes", mock_return)
+    result = sweep(test_schedule_df, [0.2], [1], max_tries=3)
+
+    assert not result["feasible"][0]
+    assert result["attempts"][0] == 3
+
+
+def test_sweep_encodes_once(monkeypatch, test_schedule_df):
+    calls = []
+    from_columns = EncodedProblem.from_columns
+
+    def mock_from_columns(*args, **kwargs):
+        calls.append(1)
+        return from_columns(*args, **kwargs)
+
+    monkeypatch.setattr(EncodedProblem, "from_columns", mock_from_columns)
+    sweep(test_schedule_df, [0.1, 0.2, 0.5], [1, 5])
+
+    assert len(calls) == 1
+
+
+def test_sweep_uses_engine(monkeypatch, test_schedule_df):
+    def mock_build_schedule(*args, **kwargs):
+        raise AssertionError("The sweep should not build a full schedule")
+
+    monkeypatch.setattr(ScheduleBuilder, "_build_schedule", mock_build_schedule)
+    result = sweep(test_schedule_df, [0.2, 0.5], [1])
+
+    assert result["feasible"].all()
+
+
+def test_find_min_reduce_by(test_schedule_df):
+    reduce_by, schedule_df = find_min_reduce_by(test_schedule_df, 1, low=0.1, precision=0.05)
+
+    expected_student_classes = test_schedule_df.groupby("student").size().to_dict()
+    student_classes = schedule_df.groupby("student").size().to_dict()
+
+    assert 0.1 <= reduce_by <= 1.0
+    assert student_classes == expected_student_classes
+
+
+def test_find_min_reduce_by_uses_engine(monkeypatch, test_schedule_df):
+    def mock_build_schedule(*args, **kwargs):
+        raise AssertionError("The search should not build a full schedule for every setting")
+
+    monkeypatch.setattr(ScheduleBuilder, "_build_schedule", mock_build_schedule)
+    reduce_by, schedule_df = find_min_reduce_by(test_schedule_df, low=0.1, precision=0.05)
+
+    schedule_builder = ScheduleBuilder()
+    schedule_builder._set_schedule_df(test_schedule_df)
+    schedule_builder._validate_generated_schedule(
+        schedule_df.reset_index(drop=True), reduce_by, max_tries=1
+    )
+
+    assert schedule_builder._attempt == 1
+    assert schedule_df.columns.values.tolist() == list(SCHEDULE_COLUMNS)
+
+
+def test_find_min_reduce_by_threshold(monkeypatch, test_schedule_df):
+    build_fill_classes = ScheduleEngine._build_fill_classes
+    tried = []
+
+    def mock_build_fill_classes(self, reduce_by, smallest_allowed=1, max_tries=10):
+        tried.append(reduce_by)
+        if reduce_by < 0.4:
+            raise SchedulingError("No possible schedule found")
+        return build_fill_classes(self, reduce_by, smallest_allowed, max_tries)
+
+    monkeypatch.setattr(ScheduleEngine, "_build_fill_classes", mock_build_fill_classes)
+    reduce_by, schedule_df = find_min_reduce_by(test_schedule_df, precision=0.01)
+
+    schedule_builder = ScheduleBuilder()
+    schedule_builder._set_schedule_df(test_schedule_df)
+    class_sizes = [
+        c["max_students"]
+        for c in schedule_builder._reduce_class(schedule_builder._get_class_size(), reduce_by, 1)
+    ]
+    expected_class_sizes = [
+        c["max_students"]
+        for c in schedule_builder._reduce_class(schedule_builder._get_class_size(), 0.4, 1)
+    ]
+
+    assert reduce_by <= 0.4
+    assert class_sizes == expected_class_sizes
+    assert schedule_df is not None
+    assert len(tried) < 10
+
+
+def test_find_min_reduce_by_none_feasible(monkeypatch, test_schedule_df):
+    def mock_return(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(ScheduleEngine, "_fill_classes", mock_return)
+
+    with pytest.raises(SchedulingError):
+        find_min_reduce_by(test_schedule_df, max_tries=1)
+
+
+@pytest.mark.parametrize("low, high, precision", [(0, 1, 0.1), (0.5, 0.2, 0.1), (0.1, 1, 0)])
+def test_find_min_reduce_by_bad_bounds(low, high, precision, test_schedule_df):
+    with pytest.raises(ValueError):
+        find_min_reduce_by(test_schedule_df, low=low, high=high, precision=precision)